@@ -1,6 +1,6 @@
 # An os-agnostic handler for ipc via named pipes.
 
-from .pipecom import Pipe, send
+from .pipecom import Connection, Pipe, connection, exists, send, send_async, send_many, sendv, try_send
 from ._exceptions import PipeError
 
-__all__ = ['Pipe', 'send', 'PipeError']
+__all__ = ['Connection', 'Pipe', 'connection', 'exists', 'send', 'send_async', 'send_many', 'sendv', 'try_send', 'PipeError']
@@ -16,18 +16,29 @@ class PipeError(Exception):
     UNKNOWN = "UNKNOWN"
     DEBUG = "DEBUG"
 
-    def __init__(self, message: str, error_code: str, context=None):
+    def __init__(self, message: str, error_code: str, context=None, context_factory=None):
         """Initialize PipeError.
 
         Args:
             message (str): Human-readable error message
             error_code (str): Error code identifying the error type
             context (dict, optional): Additional context about the error
+            context_factory (callable, optional): Returns the context dict; only called when the context is first read
         """
         self.error_code = error_code
-        self.context = context or {}
+        self._context = context or None
+        self._context_factory = context_factory
         super().__init__(message)
 
+    @property
+    def context(self):
+        """Additional context about the error, built on first access if a factory was given."""
+        if self._context is None:
+            factory = self._context_factory
+            self._context = (factory() if factory is not None else None) or {}
+            self._context_factory = None
+        return self._context
+
     def __str__(self):
         """Return string representation of the error."""
         base_msg = f"PipeError (Code: {self.error_code}): {super().__str__()}"
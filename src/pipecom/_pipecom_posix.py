@@ -1,104 +1,329 @@
-import signal
+import atexit
+import errno
+import fcntl
 import os
+import select
+import selectors
 from ._exceptions import PipeError
-from threading import Thread
+from threading import Event, Lock, Thread
+from concurrent.futures import ThreadPoolExecutor
 import time
-import base64
+import struct
 
-ACK = "ACK"
+ACK_WIRE = b"ACK\n"
+
+# Each message is framed as a 4-byte big-endian payload length and a flags byte, followed by the raw UTF-8 payload
+_HEADER = struct.Struct('>IB')
+
+# Frame flag: the sender is not waiting for an ACK
+_FLAG_NO_ACK = 0x01
+
+# Listener worker pool size, and how long a worker waits for a sender to collect an ACK
+_MAX_WORKERS = 8
+_ACK_TIMEOUT = 5
+
+# send_many() writes at most this many bytes at once by default, and never more buffers than writev() accepts
+_MAX_BATCH_BYTES = 1 << 20
+_MAX_BATCH_BUFFERS = os.sysconf('SC_IOV_MAX') if 'SC_IOV_MAX' in os.sysconf_names else 1024
+
+# Frames claiming a longer payload than this are treated as corrupt by the listener
+_MAX_FRAME_BYTES = 1 << 26
+
+# Senders keep their FIFO descriptors open between messages, keyed by (path, open flags)
+_fd_cache: dict[tuple[str, int], int] = {}
+_fd_lock = Lock()
+
+# One exchange (a send's writes and the ACKs it waits for) runs at a time per pipe: this
+# lock orders the threads of a process, and flock() on the FIFO orders processes
+_exchange_locks: dict[str, Lock] = {}
 
 
 def _validate_pipe_name(pipe_name: str):
     """Validate pipe name to prevent problematic names."""
-    if not pipe_name or not pipe_name.strip():
+    # isspace() is False for "", so the emptiness check has to come first
+    if not pipe_name or pipe_name.isspace():
         raise PipeError("Pipe name cannot be empty or only whitespace", PipeError.INVALID_PIPE_NAME)
 
-    # Additional validation for problematic names
-    if pipe_name.isspace():
-        raise PipeError("Pipe name cannot be only whitespace", PipeError.INVALID_PIPE_NAME)
-
 
-def listen(pipe_name: str, callback: callable, timeout: int, max_messages: int, die_code: str, daemon: bool, response_pipe_name: str, buffer_size: int):
+def listen(pipe_name: str, callback: callable, timeout: int, max_messages: int, die_code: str, daemon: bool, response_pipe_name: str, buffer_size: int, on_stop: callable = None):
     # Validate pipe name first
     _validate_pipe_name(pipe_name)
 
+    stop_event = Event()
     pipe_thread = Thread(target=_handler, args=(pipe_name, callback, max_messages,
-                         die_code, response_pipe_name), daemon=daemon)
+                         die_code, response_pipe_name, buffer_size, stop_event, on_stop), daemon=daemon)
     pipe_thread.start()
     if timeout > 0:
-        kill_thread = Thread(target=_kill_pipe, args=(pipe_name, timeout, die_code, pipe_thread), daemon=True)
+        kill_thread = Thread(target=_kill_pipe, args=(pipe_name, timeout, die_code,
+                             pipe_thread, stop_event), daemon=True)
         kill_thread.start()
 
 
-def send(pipe_name: str, message: str, timeout: int, max_attempts: int = 0) -> bool:
+def exists(pipe_name: str) -> bool:
     # Validate pipe name first
     _validate_pipe_name(pipe_name)
-
-    ack_pipe_name = pipe_name + "_ack"
-    fifo_in = None
-    fifo_out = None
     try:
-        _make_fifos(pipe_name, ack_pipe_name)
-    except Exception:
-        raise
+        # A non-blocking write open succeeds only while a listener has the FIFO open for reading
+        fd = os.open(pipe_name, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError as e:
+        if e.errno in (errno.ENOENT, errno.ENXIO):
+            # No FIFO at all, or one left behind with nobody listening on it
+            return False
+        raise PipeError(f"Failed to probe pipe '{pipe_name}': {e}", PipeError.UNKNOWN)
+    os.close(fd)
+    return True
 
-    def alarm_handler(signum, frame):
-        raise PipeError(f"Timeout while waiting for response from pipe '{pipe_name}'", PipeError.TIMEOUT)
 
-    # Only set signal handler if we're in the main thread
-    old_handler = None
-    try:
-        old_handler = signal.signal(signal.SIGALRM, alarm_handler)
-        signal.alarm(timeout)
-        use_signal = True
-    except ValueError:
-        # Not in main thread, can't use signals
-        use_signal = False
+def send(pipe_name: str, message: str | bytes, timeout: int, max_attempts: int = 0, ack: bool = True) -> bool:
+    return send_many(pipe_name, (message,), timeout, max_attempts, ack, _MAX_BATCH_BYTES)
 
-    try:
-        fifo_out = open(pipe_name, 'w', 1)
 
-        encoded_message = base64.b64encode(message.encode('utf-8')).decode('utf-8')
-        fifo_out.write(encoded_message + '\n')
-        fifo_out.close()
-        fifo_out = None
+def send_many(pipe_name: str, messages, timeout: int, max_attempts: int = 0, ack: bool = True, batch_size: int = _MAX_BATCH_BYTES) -> bool:
+    # Validate pipe name first
+    _validate_pipe_name(pipe_name)
+    return _send_batches(pipe_name, _batches(messages, 0 if ack else _FLAG_NO_ACK, batch_size), timeout, ack)
 
-        fifo_in = open(ack_pipe_name, 'r')
 
-        # Manual timeout check for non-main threads
-        if not use_signal:
-            # Use select or polling for timeout in threads
-            import select
-            ready, _, _ = select.select([fifo_in], [], [], timeout)
-            if not ready:
-                raise PipeError(
-                    f"Timeout while waiting for response from pipe '{pipe_name}'", PipeError.TIMEOUT)
+def sendv(pipe_name: str, buffers, timeout: int, max_attempts: int = 0, ack: bool = True) -> bool:
+    # Validate pipe name first
+    _validate_pipe_name(pipe_name)
 
-        res = fifo_in.readline().strip()
-        res = base64.b64decode(res.encode('utf-8'))
-        if res != ACK.encode('utf-8'):
-            raise PipeError(f"Invalid response from pipe '{pipe_name}': {res}", PipeError.UNKNOWN)
-        fifo_in.close()
-        fifo_in = None
+    # Byte views, so the header counts bytes rather than items of wider buffers (e.g. array('H'))
+    buffers = [memoryview(buffer).cast('B') for buffer in buffers]
+    if len(buffers) >= _MAX_BATCH_BUFFERS:
+        # More pieces than one writev() accepts alongside the header
+        buffers = [b"".join(buffers)]
+    length = sum(map(len, buffers))
+    _check_length(length)
+    header = _HEADER.pack(length, 0 if ack else _FLAG_NO_ACK)
+    # The pieces are one message, so the listener sees them as a single payload
+    return _send_batches(pipe_name, (([header, *buffers], 1),), timeout, ack)
 
-        return True  # Success
+
+def close(pipe_name: str):
+    # Validate pipe name first
+    _validate_pipe_name(pipe_name)
+    with _fd_lock:
+        exchange = _exchange_locks.setdefault(pipe_name, Lock())
+    # Wait out a send in progress, so its descriptors are not closed under it
+    with exchange:
+        _drop_fds({key: _fd_cache.get(key) for key in ((pipe_name, os.O_WRONLY), (pipe_name + "_ack", os.O_RDONLY))})
+
+
+def _send_batches(pipe_name, batches, timeout, ack):
+    """Write each (buffers, message count) batch with one gathered write and collect its ACKs.
+
+    The whole call is one exchange on the pipe, so frames from concurrent senders never
+    interleave and every ACK read belongs to a message this call sent.
+    """
+    ack_pipe_name = pipe_name + "_ack"
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+    out_key = (pipe_name, os.O_WRONLY)
+    in_key = (ack_pipe_name, os.O_RDONLY)
+    # The descriptors this call used; on failure only these are dropped, and only if still cached
+    used = {}
+
+    with _fd_lock:
+        exchange = _exchange_locks.setdefault(pipe_name, Lock())
+    if not exchange.acquire(timeout=-1 if deadline is None else max(0, deadline - time.monotonic())):
+        raise PipeError(f"Timeout while waiting for another send on pipe '{pipe_name}'", PipeError.TIMEOUT)
+
+    try:
+        locked_fd = None
+        try:
+            for frames, count in batches:
+                fifo_out = used[out_key] = _get_or_open(pipe_name, ack_pipe_name, os.O_WRONLY, _time_left(deadline))
+                if fifo_out != locked_fd:
+                    locked_fd = _lock_fifo(pipe_name, fifo_out, deadline)
+                try:
+                    _writev_all(fifo_out, frames)
+                except BrokenPipeError:
+                    # The listener behind the cached descriptor has gone away, and the cached ACK
+                    # reader belongs to the same dead pipe pair; reconnect once. Closing the
+                    # descriptor releases its lock.
+                    locked_fd = None
+                    _drop_fds({out_key: fifo_out, in_key: used.get(in_key, _fd_cache.get(in_key))})
+                    fifo_out = used[out_key] = _get_or_open(pipe_name, ack_pipe_name, os.O_WRONLY, _time_left(deadline))
+                    locked_fd = _lock_fifo(pipe_name, fifo_out, deadline)
+                    _writev_all(fifo_out, frames)
+
+                if ack:
+                    # Every message in the batch is acknowledged on its own
+                    fifo_in = used[in_key] = _get_or_open(pipe_name, ack_pipe_name, os.O_RDONLY, _time_left(deadline))
+                    _await_acks(pipe_name, fifo_in, count, deadline)
+
+            # Fire and forget: the listener will not answer, so the ACK pipe is never touched
+            return True  # Success
+        finally:
+            # Unlock before any descriptor is dropped, while the number still refers to our FIFO
+            if locked_fd is not None:
+                fcntl.flock(locked_fd, fcntl.LOCK_UN)
+            exchange.release()
 
     except PipeError:
+        _drop_fds(used)
         raise
 
     except Exception as e:
+        _drop_fds(used)
         raise PipeError(f"Failed to open pipe '{pipe_name}': {e}", PipeError.UNKNOWN)
 
-    finally:
-        if use_signal:
-            signal.alarm(0)
-            if old_handler is not None:
-                signal.signal(signal.SIGALRM, old_handler)
 
-        if fifo_in is not None:
-            fifo_in.close()
-        if fifo_out is not None:
-            fifo_out.close()
+def _time_left(deadline):
+    """Seconds left until deadline as an open timeout, where 0 means no deadline."""
+    if deadline is None:
+        return 0
+    # Never 0 once a deadline is set, since that would mean waiting indefinitely
+    return max(deadline - time.monotonic(), 0.001)
+
+
+def _lock_fifo(pipe_name, fd, deadline):
+    """Take the cross-process lock on a FIFO writer; returns fd, or None if flock() is unsupported."""
+    while True:
+        try:
+            if deadline is None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                raise PipeError(f"Timeout while waiting for another send on pipe '{pipe_name}'", PipeError.TIMEOUT)
+            time.sleep(0.001)
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+            # Some platforms cannot lock FIFOs; senders are then only ordered within a process
+            return None
+
+
+def _writev_all(fd, buffers):
+    """Write every byte of buffers to fd, continuing after short writes.
+
+    A pipe write can return early (a signal, or a large write landing in pieces),
+    so keep calling writev() on whatever the previous call did not cover.
+    """
+    views = [memoryview(buffer).cast('B') for buffer in buffers]
+    start = 0
+    while start < len(views):
+        written = os.writev(fd, views[start:] if start else views)
+        # Skip the buffers that were written in full, then trim the partly written one
+        while start < len(views) and written >= len(views[start]):
+            written -= len(views[start])
+            start += 1
+        if written:
+            views[start] = views[start][written:]
+
+
+def _batches(messages, flags, batch_size):
+    """Frame messages and group the frames into batches of at most batch_size bytes.
+
+    Yields (buffers, message count) pairs, where buffers holds the header and payload
+    of each message for a single gathered write. A message larger than batch_size
+    still goes out, in a batch of its own; with a batch_size of 0 every message is
+    its own batch.
+    """
+    pack = _HEADER.pack
+    frames = []
+    size = 0
+    for message in messages:
+        # Bytes are sent as they are; only str needs encoding
+        raw = message.encode('utf-8') if isinstance(message, str) else message
+        _check_length(len(raw))
+        frame_size = _HEADER.size + len(raw)
+        if frames and (size + frame_size > batch_size or len(frames) >= _MAX_BATCH_BUFFERS):
+            yield frames, len(frames) // 2
+            frames = []
+            size = 0
+        # Header and payload go out in one gathered write, without concatenating them first
+        frames += (pack(len(raw), flags), raw)
+        size += frame_size
+    if frames:
+        yield frames, len(frames) // 2
+
+
+def _check_length(length):
+    if length > _MAX_FRAME_BYTES:
+        raise PipeError(f"Message of {length} bytes exceeds the {_MAX_FRAME_BYTES} byte limit", PipeError.UNKNOWN)
+
+
+def _await_acks(pipe_name, fifo_in, count, deadline):
+    """Wait for count ACKs with whatever is left of the timeout; this works from any thread."""
+    expected = ACK_WIRE * count
+    poller = select.poll()
+    poller.register(fifo_in, select.POLLIN)
+    res = b""
+    while len(res) < len(expected):
+        wait_ms = None if deadline is None else max(0, int((deadline - time.monotonic()) * 1000))
+        if not poller.poll(wait_ms):
+            raise PipeError(
+                f"Timeout while waiting for response from pipe '{pipe_name}'", PipeError.TIMEOUT)
+        try:
+            chunk = os.read(fifo_in, len(expected) - len(res))
+        except BlockingIOError:
+            continue
+        if not chunk:
+            # The listener closed its end before answering every message
+            break
+        res += chunk
+    if res != expected:
+        raise PipeError(f"Invalid response from pipe '{pipe_name}': {res}", PipeError.UNKNOWN)
+
+
+def _get_or_open(pipe_name, ack_pipe_name, flags, timeout):
+    """Return the cached descriptor for one end of a pipe pair, opening it on first use.
+
+    O_WRONLY opens the message pipe and O_RDONLY opens the acknowledgment pipe. The
+    acknowledgment pipe is opened non-blocking so the open never waits for the
+    listener; send() polls it for the ACK instead.
+    """
+    path = pipe_name if flags == os.O_WRONLY else ack_pipe_name
+    key = (path, flags)
+    fd = _fd_cache.get(key)
+    if fd is not None:
+        return fd
+
+    if flags == os.O_WRONLY:
+        _make_fifos(pipe_name, ack_pipe_name)
+    # Open outside the lock: opening a FIFO for writing waits until the other end is opened
+    fd = _open_writer(path, timeout) if flags == os.O_WRONLY else os.open(path, flags | os.O_NONBLOCK)
+    with _fd_lock:
+        cached = _fd_cache.setdefault(key, fd)
+    if cached != fd:
+        os.close(fd)
+    return cached
+
+
+def _drop_fds(used):
+    """Close and forget cached descriptors, given as {cache key: descriptor}.
+
+    A descriptor is only closed if it is still the cached one for its key, so a
+    descriptor another thread has since replaced (or whose number has been reused)
+    is left alone.
+    """
+    fds = []
+    with _fd_lock:
+        for key, fd in used.items():
+            if fd is not None and _fd_cache.get(key) == fd:
+                del _fd_cache[key]
+                fds.append(fd)
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+@atexit.register
+def _close_cached_fds():
+    with _fd_lock:
+        fds = list(_fd_cache.values())
+        _fd_cache.clear()
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
 
 
 def _make_fifos(pipe_name, ack_pipe_name):
@@ -120,44 +345,69 @@ def _make_fifos(pipe_name, ack_pipe_name):
         raise PipeError(f"Failed to create pipe '{pipe_name}'", PipeError.UNKNOWN)
 
 
-def _handler(pipe_name, callback, max_messages, die_code, response_pipe_name):
+def _handler(pipe_name, callback, max_messages, die_code, response_pipe_name, buffer_size, stop_event, on_stop):
     keep_alive = True
     ack_pipe_name = pipe_name + "_ack"
     message_count = 0
-
-    def handle_connection(fifo_in):
+    ack_fd = None
+    write = os.write
+    die_bytes = die_code.encode('utf-8')
+    # functools.partial objects and callable instances have no __name__
+    callback_name = getattr(callback, '__qualname__', repr(callback))
+    # Serializes ACK writes and message counting across pool workers
+    state_lock = Lock()
+
+    def write_ack():
+        nonlocal ack_fd
+        reopened = False
+        while True:
+            with state_lock:
+                if ack_fd is not None:
+                    try:
+                        write(ack_fd, ACK_WIRE)
+                        return
+                    except BrokenPipeError:
+                        # The previous reader has gone away (e.g. its process exited); wait for
+                        # this message's sender to open the ACK pipe and answer it there
+                        os.close(ack_fd)
+                        ack_fd = None
+                        if reopened:
+                            raise
+                        reopened = True
+            # Opening waits for a sender to open the ACK pipe, so it happens outside the lock
+            # and never holds up other workers' ACKs or message counting
+            fd = _open_writer(ack_pipe_name, _ACK_TIMEOUT)
+            with state_lock:
+                if ack_fd is None:
+                    ack_fd, fd = fd, None
+            if fd is not None:
+                # Another worker opened one first
+                os.close(fd)
+
+    def handle_message(message, wants_ack):
         nonlocal keep_alive
-        nonlocal ack_pipe_name
-        nonlocal pipe_name
         nonlocal message_count
 
-        fifo_out = None
+        result = None
         try:
-            message = fifo_in.readline().strip()
-            fifo_in.close()
-            if message == '':  # Process has disconnected from other end of pipe
-                return
-            decoded_message = base64.b64decode(message).decode('utf-8')
-            if decoded_message == die_code:
+            if message == die_bytes:
                 keep_alive = False
                 # Still send acknowledgment for die code
-                fifo_out = open(ack_pipe_name, 'w', 1)
-                encoded_ack = base64.b64encode(ACK.encode('utf-8')).decode('utf-8')
-                fifo_out.write(encoded_ack + '\n')
-                fifo_out.close()
+                if wants_ack:
+                    write_ack()
                 return  # Don't cleanup here - let the main handler do it
+            decoded_message = message.decode('utf-8')
             result = callback(decoded_message)
 
             # Count messages after successful processing
             if max_messages > 0:
-                message_count += 1
-                if message_count >= max_messages:
-                    keep_alive = False
+                with state_lock:
+                    message_count += 1
+                    if message_count >= max_messages:
+                        keep_alive = False
 
-            fifo_out = open(ack_pipe_name, 'w', 1)
-            encoded_ack = base64.b64encode(ACK.encode('utf-8')).decode('utf-8')
-            fifo_out.write(encoded_ack + '\n')
-            fifo_out.close()
+            if wants_ack:
+                write_ack()
 
             # Send result to response pipe if configured
             if response_pipe_name is not None and result is not None:
@@ -165,65 +415,137 @@ def _handler(pipe_name, callback, max_messages, die_code, response_pipe_name):
                     send(response_pipe_name, str(result), timeout=5, max_attempts=3)
                 except Exception as e:
                     print(f"Warning: Failed to send to response pipe '{response_pipe_name}': {e}")
-        except Exception:
-            # Handle broken pipe errors gracefully - they can occur during shutdown
-            try:
-                raise PipeError(
-                    message="Error in listen handler",
-                    error_code=PipeError.UNKNOWN,
-                    context={
-                        "pipe_name": pipe_name,
-                        "callback":  callback.__name__,
-                        "response_pipe_name": response_pipe_name,
-                    }
-                )
-            except BrokenPipeError:
-                # Broken pipe during shutdown is expected
-                pass
-        finally:
-            try:
-                if fifo_in is not None:
-                    fifo_in.close()
-                if fifo_out is not None:
-                    fifo_out.close()
-            except BrokenPipeError:
-                # Broken pipe during cleanup is expected during shutdown
-                pass
-            # Don't cleanup fifos here - they should persist for multiple connections
+        except BrokenPipeError:
+            # Broken pipe during shutdown is expected
+            pass
+        except (OSError, ValueError) as e:
+            raise PipeError(
+                message="Error in listen handler",
+                error_code=PipeError.UNKNOWN,
+                context_factory=lambda: {
+                    "pipe_name": pipe_name,
+                    "callback":  callback_name,
+                    "response_pipe_name": response_pipe_name,
+                }
+            ) from e
 
         return result
 
-    try:
-        _make_fifos(pipe_name, ack_pipe_name)
-    except Exception:
-        pipe_open, ack_open, exceptions = _cleanup_fifos(pipe_name, ack_pipe_name)
-        if not pipe_open and not ack_open:
-            raise PipeError(f"Failed to create pipes '{pipe_name}' or '{ack_pipe_name}'", PipeError.UNKNOWN)
-        exception_msg = 'Failed to clean up pipe(s): '
-        if pipe_open:
-            exception_msg += f"\nPipe '{pipe_name}' is still open. "
-        if ack_open:
-            exception_msg += f"\nAcknowledgment pipe '{ack_pipe_name}' is still open. "
-        if exceptions:
-            exception_msg += "\nExceptions encountered:"
-            for e in exceptions:
-                exception_msg += f"\n- {e}"
-        raise PipeError(exception_msg, PipeError.UNKNOWN)
+    def dispatch(message, wants_ack):
+        try:
+            handle_message(message, wants_ack)
+        except PipeError as e:
+            print(f"Warning: {e}")
+        except Exception as e:
+            print(f"Warning: Callback '{callback_name}' failed on pipe '{pipe_name}': {e!r}")
 
+    fifo_in = None
+    hold_fd = None
+    sel = selectors.DefaultSelector()
+    pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix='pipecom')
+    # Why the handler stopped, if it failed; passed to on_stop
+    error = None
     try:
+        try:
+            _make_fifos(pipe_name, ack_pipe_name)
+        except Exception:
+            pipe_open, ack_open, exceptions = _cleanup_fifos(pipe_name, ack_pipe_name)
+            if not pipe_open and not ack_open:
+                raise PipeError(f"Failed to create pipes '{pipe_name}' or '{ack_pipe_name}'", PipeError.UNKNOWN)
+            exception_msg = 'Failed to clean up pipe(s): '
+            if pipe_open:
+                exception_msg += f"\nPipe '{pipe_name}' is still open. "
+            if ack_open:
+                exception_msg += f"\nAcknowledgment pipe '{ack_pipe_name}' is still open. "
+            if exceptions:
+                exception_msg += "\nExceptions encountered:"
+                for e in exceptions:
+                    exception_msg += f"\n- {e}"
+            raise PipeError(exception_msg, PipeError.UNKNOWN)
+
+        fifo_in = os.open(pipe_name, os.O_RDONLY | os.O_NONBLOCK)
+        # Hold a writer open on our own FIFO so the reader never sees EOF between clients
+        hold_fd = os.open(pipe_name, os.O_WRONLY | os.O_NONBLOCK)
+        sel.register(fifo_in, selectors.EVENT_READ)
+
+        # Bind the per-message lookups once so the loop body only touches locals
+        select = sel.select
+        read = os.read
+        unpack_from = _HEADER.unpack_from
+        header_size = _HEADER.size
+
+        buffer = bytearray()
         while keep_alive:
-            try:
-                # blocking, awaits a connection
-                fifo_in = open(pipe_name, 'r')
-
-                # connection made
-                Thread(target=handle_connection, args=(fifo_in,), daemon=True).start()
-
-            except Exception:
-                raise
+            if not select(timeout=0.5):
+                continue
+            buffer += read(fifo_in, buffer_size)
+
+            # Dispatch every complete frame currently buffered
+            while keep_alive and len(buffer) >= header_size:
+                length, flags = unpack_from(buffer)
+                if length > _MAX_FRAME_BYTES or flags & ~_FLAG_NO_ACK:
+                    # Not a frame header, so the stream is out of step; drop what is buffered
+                    # rather than wait for a payload that will never arrive
+                    print(f"Warning: Dropping {len(buffer)} unframed bytes on pipe '{pipe_name}'")
+                    buffer.clear()
+                    break
+                end = header_size + length
+                if len(buffer) < end:
+                    break
+                # Slicing the bytearray is the only copy; the payload is decoded straight from it
+                message = buffer[header_size:end]
+                del buffer[:end]
+                wants_ack = not flags & _FLAG_NO_ACK
+                if message == die_bytes:
+                    # Nothing to run for the die code, so skip the pool round-trip
+                    dispatch(message, wants_ack)
+                else:
+                    pool.submit(dispatch, message, wants_ack)
+    except Exception as e:
+        # Hand the failure to whoever is waiting on the listener; without one, let the thread report it
+        error = e
+        if on_stop is None:
+            raise
     finally:
+        sel.close()
+        pool.shutdown(wait=True)
+        if ack_fd is not None:
+            os.close(ack_fd)
+        if hold_fd is not None:
+            os.close(hold_fd)
+        if fifo_in is not None:
+            os.close(fifo_in)
         # Clean up fifos when the handler exits
         _cleanup_fifos(pipe_name, ack_pipe_name)
+        stop_event.set()
+        if on_stop is not None:
+            on_stop(error)
+
+
+def _open_writer(path, timeout):
+    """Open the write end of a FIFO.
+
+    With a timeout, waits at most that many seconds for a reader to open the other
+    end instead of blocking indefinitely, so a worker can never hang forever on a
+    peer that is not there.
+    """
+    if timeout <= 0:
+        # blocking, awaits a reader
+        return os.open(path, os.O_WRONLY)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            if e.errno != errno.ENXIO:
+                raise
+            if time.monotonic() >= deadline:
+                raise PipeError(f"Timeout while waiting for a reader on pipe '{path}'", PipeError.TIMEOUT)
+            time.sleep(0.01)
+            continue
+        os.set_blocking(fd, True)
+        return fd
 
 
 def _cleanup_fifos(pipe_name,  ack_pipe_name):
@@ -258,11 +580,13 @@ def _cleanup_fifos(pipe_name,  ack_pipe_name):
     return (pipe_open, ack_pipe_open, exceptions)
 
 
-def _kill_pipe(pipe_name, timeout, die_code, pipe_thread: Thread):
-    start_time = time.time()
-    end_time = start_time + timeout
-    while time.time() < end_time:
-        time.sleep(0.1)
-    while pipe_thread is not None and pipe_thread.is_alive():
+def _kill_pipe(pipe_name, timeout, die_code, pipe_thread: Thread, stop_event: Event):
+    # Returns as soon as the handler exits on its own, otherwise once the timeout elapses
+    if stop_event.wait(timeout):
+        return
+    try:
         send(pipe_name, die_code, timeout=5, max_attempts=5)
-        pipe_thread.join(timeout=0.1)
+    except PipeError:
+        # The handler is already gone or unreachable; let it be cleaned up as a daemon thread
+        return
+    pipe_thread.join()
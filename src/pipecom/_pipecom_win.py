@@ -1,6 +1,8 @@
-from threading import Thread
+from threading import Event, Thread, local
+from concurrent.futures import ThreadPoolExecutor
+import ctypes
+from ctypes import wintypes
 import time
-import base64
 
 import win32file
 import win32pipe
@@ -14,139 +16,126 @@ import ntsecuritycon as ntc
 
 from ._exceptions import PipeError
 
-ACK = "ACK".encode('utf-8')
+ACK = b"ACK"
+
+# Every message starts with a flags byte; this bit means the sender is not waiting for an ACK
+_FLAG_NO_ACK = 0x01
+_PREFIX_ACK = bytes((0,))
+_PREFIX_NO_ACK = bytes((_FLAG_NO_ACK,))
+
+# Number of pipe instances each listener keeps armed, and the size of its callback worker pool
+_PIPE_INSTANCES = 8
+_MAX_WORKERS = 8
+
+# Default for send_many()'s batch_size; only the POSIX backend batches, but the default matches
+_MAX_BATCH_BYTES = 1 << 20
+
+# The only thing a listener writes back is the ACK, so its outbound pipe buffer stays small
+_OUT_BUFFER_SIZE = 64
+
+# SetFileCompletionNotificationModes is not wrapped by pywin32
+_kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+_kernel32.SetFileCompletionNotificationModes.argtypes = (wintypes.HANDLE, ctypes.c_ubyte)
+_kernel32.SetFileCompletionNotificationModes.restype = wintypes.BOOL
+_FILE_SKIP_COMPLETION_PORT_ON_SUCCESS = 0x1
+_FILE_SKIP_SET_EVENT_ON_HANDLE = 0x2
+
+# Per-thread OVERLAPPED for sends with a timeout; its event handle is closed when the thread's locals are freed
+_send_state = local()
 
 
 def _validate_pipe_name(pipe_name: str):
     """Validate pipe name to prevent problematic names."""
-    if not pipe_name or not pipe_name.strip():
+    # isspace() is False for "", so the emptiness check has to come first
+    if not pipe_name or pipe_name.isspace():
         raise PipeError("Pipe name cannot be empty or only whitespace", PipeError.INVALID_PIPE_NAME)
 
     if '/' in pipe_name or '\\' in pipe_name:
         raise PipeError("Pipe name cannot contain path separators", PipeError.INVALID_PIPE_NAME)
 
-    # Additional validation for problematic names
-    if pipe_name.isspace():
-        raise PipeError("Pipe name cannot be only whitespace", PipeError.INVALID_PIPE_NAME)
-
 
-def listen(pipe_name: str, callback: callable, timeout: int, max_messages: int, die_code: str, daemon: bool, response_pipe_name: str, buffer_size: int):
+def listen(pipe_name: str, callback: callable, timeout: int, max_messages: int, die_code: str, daemon: bool, response_pipe_name: str, buffer_size: int, on_stop: callable = None):
     # Validate pipe name first
     _validate_pipe_name(pipe_name)
 
+    stop_event = Event()
     pipe_string = f'\\\\.\\pipe\\{pipe_name}'
     pipe_thread = Thread(target=_handler, args=(pipe_string, callback,
-                         max_messages, die_code, response_pipe_name, buffer_size), daemon=daemon)
+                         max_messages, die_code, response_pipe_name, buffer_size, stop_event, on_stop), daemon=daemon)
     pipe_thread.start()
     if timeout > 0:
-        kill_thread = Thread(target=_kill_pipe, args=(pipe_name, timeout, die_code, pipe_thread), daemon=True)
+        kill_thread = Thread(target=_kill_pipe, args=(pipe_name, timeout, die_code,
+                             pipe_thread, stop_event), daemon=True)
         kill_thread.start()
 
 
-def send(pipe_name: str, message: str, timeout: int, max_attempts: int) -> bool:
+def exists(pipe_name: str) -> bool:
+    # Validate pipe name first
+    _validate_pipe_name(pipe_name)
+    try:
+        # A timeout of 0 would mean the pipe's default wait, so wait for the shortest time instead
+        win32pipe.WaitNamedPipe(f'\\\\.\\pipe\\{pipe_name}', 1)
+    except pywintypes.error as e:
+        if e.winerror == winerror.ERROR_FILE_NOT_FOUND:
+            return False
+        # Every instance is busy, which still means a listener is there
+        if e.winerror == winerror.ERROR_SEM_TIMEOUT:
+            return True
+        raise PipeError(
+            message=f"Failed to probe pipe: {e}",
+            error_code=PipeError.UNKNOWN,
+            context={
+                "pipe_name": pipe_name,
+                "error": str(e)
+            }
+        )
+    return True
+
+
+def send(pipe_name: str, message: str | bytes, timeout: int, max_attempts: int, ack: bool = True) -> bool:
+    # Bytes are sent as they are; only str needs encoding
+    raw = message.encode('utf-8') if isinstance(message, str) else message
+    return _send(pipe_name, (raw,), timeout, max_attempts, ack)
+
+
+def sendv(pipe_name: str, buffers, timeout: int, max_attempts: int, ack: bool = True) -> bool:
+    # A pipe message has to be written in one WriteFile call, so the pieces are joined
+    return _send(pipe_name, buffers, timeout, max_attempts, ack)
+
+
+def close(pipe_name: str):
+    # Validate pipe name first
+    _validate_pipe_name(pipe_name)
+    # Every send opens and closes its own client handle, so nothing is held between sends
+
+
+def _send(pipe_name, buffers, timeout, max_attempts, ack):
     # Validate pipe name first
     _validate_pipe_name(pipe_name)
 
+    pipe = None
     try:
         pipe_string = f'\\\\.\\pipe\\{pipe_name}'
-        if timeout > 0:
-            pipe = win32file.CreateFile(
-                pipe_string,
-                win32con.GENERIC_READ | win32con.GENERIC_WRITE,
-                0,
-                None,
-                win32con.OPEN_EXISTING,
-                win32con.FILE_FLAG_OVERLAPPED,
-                None
-            )
+        pipe = _open_client(pipe_string, win32con.FILE_FLAG_OVERLAPPED if timeout > 0 else 0, timeout)
+
+        if ack:
+            # TransactNamedPipe needs the client end in message-read mode
+            win32pipe.SetNamedPipeHandleState(pipe, win32pipe.PIPE_READMODE_MESSAGE, None, None)
+        encoded_message = b''.join((_PREFIX_ACK if ack else _PREFIX_NO_ACK, *buffers))
+
+        # Pick the exchange once so the retry loop does not re-check the mode on every attempt
+        if not ack:
+            exchange = _notify
+        elif timeout > 0:
+            exchange = _transact_overlapped
         else:
-            pipe = win32file.CreateFile(
-                pipe_string,
-                win32con.GENERIC_READ | win32con.GENERIC_WRITE,
-                0,
-                None,
-                win32con.OPEN_EXISTING,
-                0,
-                None
-            )
-
-        win32pipe.SetNamedPipeHandleState(pipe, win32pipe.PIPE_READMODE_MESSAGE, None, None)
-        encoded_message = base64.b64encode(message.encode('utf-8'))
+            exchange = _transact_sync
 
         attempt = 0
         start_time = time.time()
         while attempt < max_attempts or max_attempts == 0:
             try:
-                win32file.WriteFile(pipe, encoded_message)
-                # Wait for ACK with timeout
-                if timeout > 0:
-                    overlapped = pywintypes.OVERLAPPED()
-                    overlapped.Offset = 0  # Starting offset for the read operation
-                    overlapped.hEvent = win32event.CreateEvent(None, 1, 0, None)  # Create an event
-                    buffer = win32file.AllocateReadBuffer(3)
-                    ready = win32file.ReadFile(pipe, buffer, overlapped)
-                    hr, response = ready
-                    if hr == winerror.ERROR_IO_PENDING:
-                        remaining_time = int((start_time + timeout - time.time()) * 1000)
-                        if remaining_time < 0:
-                            raise PipeError(
-                                message="Timeout waiting for ACK",
-                                error_code=PipeError.TIMEOUT,
-                                context={
-                                    "pipe_name": pipe_string,
-                                    "timeout": timeout,
-                                    "attempts": attempt + 1
-                                }
-                            )
-                        wait_result = win32event.WaitForSingleObject(overlapped.hEvent, remaining_time)
-                        if wait_result == win32con.WAIT_TIMEOUT:
-                            # Cancel the pending operation
-                            try:
-                                win32file.CancelIo(pipe)
-                            except Exception:
-                                pass
-                            raise PipeError(
-                                message="Timeout waiting for ACK",
-                                error_code=PipeError.TIMEOUT,
-                                context={
-                                    "pipe_name": pipe_string,
-                                    "timeout": timeout,
-                                    "attempts": attempt + 1
-                                }
-                            )
-                        elif wait_result == win32con.WAIT_OBJECT_0:
-                            # Operation completed successfully, continue with GetOverlappedResult
-                            bytes_read = win32file.GetOverlappedResult(pipe, overlapped, True)
-                            data = buffer[:bytes_read]
-                        else:
-                            # Wait failed for some other reason
-                            raise PipeError(
-                                message="Wait operation failed",
-                                error_code=PipeError.UNKNOWN,
-                                context={
-                                    "pipe_name": pipe_string,
-                                    "wait_result": wait_result,
-                                    "attempts": attempt + 1
-                                }
-                            )
-                    else:
-                        # Operation completed synchronously
-                        data = response  # Use the response data directly
-                else:
-                    hr, data = win32file.ReadFile(pipe, 3)
-
-                if data == ACK:
-                    return True
-                else:
-                    raise PipeError(
-                        message=f"Expected ACK but received {data}",
-                        error_code=PipeError.UNKNOWN,
-                        context={
-                            "pipe_name": pipe_string,
-                            "expected": ACK,
-                            "received": data
-                        }
-                    )
+                return exchange(pipe, pipe_string, encoded_message, timeout, start_time, attempt)
             except pywintypes.error:
                 # If timeout is set, check if we've exceeded it
                 if timeout > 0 and (time.time() - start_time) >= timeout:
@@ -198,39 +187,47 @@ def send(pipe_name: str, message: str, timeout: int, max_attempts: int) -> bool:
         raise
 
     finally:
-        if 'pipe' in locals():
+        if pipe is not None:
             win32file.CloseHandle(pipe)
 
     return False
 
 
-def _handler(pipe_string, callback, max_messages, die_code, response_pipe_name, buffer_size):
+def send_many(pipe_name: str, messages, timeout: int, max_attempts: int, ack: bool = True, batch_size: int = _MAX_BATCH_BYTES) -> bool:
+    # A listener instance serves one message per connection, so there is no write to coalesce
+    # messages into; batch_size only matters to the POSIX backend
+    for message in messages:
+        if not send(pipe_name, message, timeout, max_attempts, ack):
+            return False
+    return True
+
+
+def _handler(pipe_string, callback, max_messages, die_code, response_pipe_name, buffer_size, stop_event, on_stop):
     keep_alive = True
+    die_bytes = die_code.encode('utf-8')
+    # functools.partial objects and callable instances have no __name__
+    callback_name = getattr(callback, '__qualname__', repr(callback))
 
-    def handle_connection(pipe):
-        nonlocal keep_alive
+    def handle_connection(index, message, wants_ack):
+        pipe = pipes[index]
         try:
-            hr, message = win32file.ReadFile(pipe, buffer_size)
-            decoded_message = base64.b64decode(message).decode('utf-8')
-            if decoded_message == die_code:
-                win32file.WriteFile(pipe, ACK)
-                keep_alive = False
-                return
+            decoded_message = message.decode('utf-8')
             result = callback(decoded_message)
-            win32file.WriteFile(pipe, ACK)
-        except Exception:
+            if wants_ack:
+                _write(pipe, write_overlappeds[index], ACK)
+        except (pywintypes.error, OSError, ValueError) as e:
             raise PipeError(
                 message="Error in listen handler",
                 error_code=PipeError.UNKNOWN,
-                context={
+                context_factory=lambda: {
                     "pipe_name": pipe_string,
-                    "callback":  callback.__name__,
+                    "callback":  callback_name,
                     "response_pipe_name": response_pipe_name,
                     "buffer_size": buffer_size
                 }
-            )
+            ) from e
         finally:
-            win32file.CloseHandle(pipe)
+            _disconnect(pipe)
 
         if response_pipe_name is not None:
             try:
@@ -239,40 +236,357 @@ def _handler(pipe_string, callback, max_messages, die_code, response_pipe_name,
                 print(f"Warning: Failed to send to response pipe '{response_pipe_name}': {e}")
         return
 
-    sa = _generate_sa()
+    def serve(index, message, wants_ack):
+        try:
+            handle_connection(index, message, wants_ack)
+        except PipeError as e:
+            print(f"Warning: {e}")
+        except Exception as e:
+            print(f"Warning: Callback '{callback_name}' failed on pipe '{pipe_string}': {e!r}")
+        finally:
+            rearm(index)
+
+    def rearm(index):
+        if not keep_alive:
+            return
+        try:
+            _connect(iocp, index, pipes[index], overlappeds[index])
+        except pywintypes.error as e:
+            # An instance that cannot be armed would never take another client; replace it
+            print(f"Warning: Failed to re-arm pipe '{pipe_string}': {e}; recreating the instance")
+            try:
+                pipe, pipes[index] = pipes[index], None
+                win32file.CloseHandle(pipe)
+                overlappeds[index] = pywintypes.OVERLAPPED()
+                open_instance(index)
+                _connect(iocp, index, pipes[index], overlappeds[index])
+            except pywintypes.error as e:
+                # Stop the listener rather than keep serving with fewer instances
+                failures.append(PipeError(
+                    message=f"Failed to recreate pipe instance: {e}",
+                    error_code=PipeError.UNKNOWN,
+                    context={
+                        "pipe_name": pipe_string,
+                        "error": str(e)
+                    }
+                ))
+                win32file.PostQueuedCompletionStatus(iocp, 0, index, None)
+
+    def open_instance(index):
+        """Create the pipe instance for index and attach it to the completion port."""
+        pipe = win32pipe.CreateNamedPipe(
+            pipe_string,
+            win32pipe.PIPE_ACCESS_DUPLEX | win32file.FILE_FLAG_OVERLAPPED,
+            win32pipe.PIPE_TYPE_MESSAGE | win32pipe.PIPE_READMODE_MESSAGE | win32pipe.PIPE_WAIT,
+            win32pipe.PIPE_UNLIMITED_INSTANCES,
+            _OUT_BUFFER_SIZE,
+            buffer_size,
+            0,
+            sa
+        )
+        pipes[index] = pipe
+        # The instance index is the completion key
+        win32file.CreateIoCompletionPort(pipe, iocp, index, 0)
+        inline_completions[index] = _skip_completion_on_success(pipe)
+
+    def start_read(index):
+        """Issue the read for a newly connected instance; returns its size if it finished inline."""
+        reading[index] = True
+        pipe = pipes[index]
+        overlapped = overlappeds[index]
+        try:
+            hr, _ = win32file.ReadFile(pipe, read_buffers[index], overlapped)
+            if hr == 0 and inline_completions[index]:
+                # Completed synchronously and no packet will be queued for it
+                return win32file.GetOverlappedResult(pipe, overlapped, False)
+        except pywintypes.error as e:
+            recycle(index, e)
+        return None
+
+    def recycle(index, error):
+        # The client went away or the read failed; reset the instance for the next client
+        reading[index] = False
+        print(f"Warning: Error reading from pipe '{pipe_string}': {error}")
+        try:
+            _disconnect(pipes[index])
+        except pywintypes.error:
+            pass
+        rearm(index)
+
+    sa = _SA
     message_count = 0
+    pipes = []
+    # Connects and reads complete on the port and are handled by this thread
+    overlappeds = []
+    # ACK writes are waited on by whichever thread owns the instance at the time
+    write_overlappeds = []
+    read_buffers = []
+    # Whether each instance's pending operation is a read (True) or a connect (False)
+    reading = []
+    # Whether each instance skips completion packets for operations that finish inline
+    inline_completions = []
+    # Errors from pool threads that must stop the listener; the main loop raises the first
+    failures = []
+    iocp = win32file.CreateIoCompletionPort(win32file.INVALID_HANDLE_VALUE, None, 0, 1)
+    pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix='pipecom')
+
+    # Why the handler stopped, if it failed; passed to on_stop
+    error = None
+    try:
+        # Pre-create a pool of instances so back-to-back clients never wait on CreateNamedPipe
+        for index in range(_PIPE_INSTANCES):
+            pipes.append(None)
+            inline_completions.append(False)
+            open_instance(index)
+            write_overlapped = pywintypes.OVERLAPPED()
+            write_overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+            overlappeds.append(pywintypes.OVERLAPPED())
+            write_overlappeds.append(write_overlapped)
+            # Reads on different instances can be in flight at once, so each has its own buffer
+            read_buffers.append(win32file.AllocateReadBuffer(buffer_size))
+            reading.append(False)
+            _connect(iocp, index, pipes[index], overlappeds[index])
+
+        while keep_alive:
+            # blocking, awaits the next connect or read completion on any instance
+            rc, bytes_read, index, overlapped = win32file.GetQueuedCompletionStatus(iocp, win32event.INFINITE)
+            if overlapped is None:
+                if failures:
+                    # Posted by rearm() after an instance could not be recreated
+                    raise failures[0]
+                raise PipeError(
+                    message="Wait operation failed",
+                    error_code=PipeError.UNKNOWN,
+                    context={
+                        "pipe_name": pipe_string,
+                        "error": rc
+                    }
+                )
+            if overlapped is not overlappeds[index]:
+                # An ACK write finishing; the thread that issued it already waited on its event
+                continue
+            if rc:
+                recycle(index, rc)
+                continue
+
+            if not reading[index]:
+                # connection made, start reading the message
+                bytes_read = start_read(index)
+                if bytes_read is None:
+                    # Still pending (or already recycled); the read completes on the port
+                    continue
+
+            reading[index] = False
+            buffer = read_buffers[index]
+            if not bytes_read:
+                recycle(index, "empty message")
+                continue
+            # Split off the leading flags byte
+            message = bytes(buffer[1:bytes_read])
+            wants_ack = not buffer[0] & _FLAG_NO_ACK
+
+            if message == die_bytes:
+                # Nothing to run for the die code, so answer it here instead of going through the pool
+                try:
+                    if wants_ack:
+                        _write(pipes[index], write_overlappeds[index], ACK)
+                finally:
+                    _disconnect(pipes[index])
+                keep_alive = False
+            else:
+                pool.submit(serve, index, message, wants_ack)
 
-    while keep_alive:
+            if max_messages > 0:
+                message_count += 1
+                if message_count >= max_messages:
+                    keep_alive = False
+    except Exception as e:
+        # Hand the failure to whoever is waiting on the listener; without one, let the thread report it
+        error = e
+        if on_stop is None:
+            raise
+    finally:
+        pool.shutdown(wait=True)
+        for pipe in pipes:
+            if pipe is not None:
+                win32file.CloseHandle(pipe)
+        for overlapped in write_overlappeds:
+            win32file.CloseHandle(overlapped.hEvent)
+        win32file.CloseHandle(iocp)
+        stop_event.set()
+        if on_stop is not None:
+            on_stop(error)
+
+
+def _notify(pipe, pipe_string, encoded_message, timeout, start_time, attempt):
+    """Fire and forget: write the message without waiting for an ACK.
+
+    Without a timeout, the handle is synchronous and the send waits until the listener has read
+    the message. With a timeout, the handle is overlapped, and the write waits only as long as
+    the send's timeout allows.
+    """
+    if timeout <= 0:
+        win32file.WriteFile(pipe, encoded_message)
+        win32file.FlushFileBuffers(pipe)
+        return True
+    overlapped = _send_overlapped()
+    hr, _ = win32file.WriteFile(pipe, encoded_message, overlapped)
+    if hr == winerror.ERROR_IO_PENDING:
+        _wait_overlapped(pipe, pipe_string, overlapped, timeout, start_time, attempt)
+    return True
+
+
+def _transact_sync(pipe, pipe_string, encoded_message, timeout, start_time, attempt):
+    """Write the message and block until its ACK comes back."""
+    hr, data = win32pipe.TransactNamedPipe(pipe, encoded_message, len(ACK))
+    return _check_ack(pipe_string, data)
+
+
+def _transact_overlapped(pipe, pipe_string, encoded_message, timeout, start_time, attempt):
+    """Write the message and wait for its ACK until the send's timeout runs out."""
+    overlapped = _send_overlapped()
+    buffer = win32file.AllocateReadBuffer(len(ACK))
+    hr, response = win32pipe.TransactNamedPipe(pipe, encoded_message, buffer, overlapped)
+    if hr != winerror.ERROR_IO_PENDING:
+        # Operation completed synchronously
+        return _check_ack(pipe_string, response)
+    bytes_read = _wait_overlapped(pipe, pipe_string, overlapped, timeout, start_time, attempt)
+    return _check_ack(pipe_string, buffer[:bytes_read])
+
+
+def _wait_overlapped(pipe, pipe_string, overlapped, timeout, start_time, attempt):
+    """Wait for a pending overlapped operation until the send's timeout runs out; return its byte count."""
+    remaining_time = int((start_time + timeout - time.time()) * 1000)
+    if remaining_time < 0:
+        raise PipeError(
+            message="Timeout waiting for ACK",
+            error_code=PipeError.TIMEOUT,
+            context={
+                "pipe_name": pipe_string,
+                "timeout": timeout,
+                "attempts": attempt + 1
+            }
+        )
+    wait_result = win32event.WaitForSingleObject(overlapped.hEvent, remaining_time)
+    if wait_result == win32con.WAIT_TIMEOUT:
+        # Cancel the pending operation
         try:
-            pipe = win32pipe.CreateNamedPipe(
+            win32file.CancelIo(pipe)
+        except Exception:
+            pass
+        raise PipeError(
+            message="Timeout waiting for ACK",
+            error_code=PipeError.TIMEOUT,
+            context={
+                "pipe_name": pipe_string,
+                "timeout": timeout,
+                "attempts": attempt + 1
+            }
+        )
+    elif wait_result != win32con.WAIT_OBJECT_0:
+        # Wait failed for some other reason
+        raise PipeError(
+            message="Wait operation failed",
+            error_code=PipeError.UNKNOWN,
+            context={
+                "pipe_name": pipe_string,
+                "wait_result": wait_result,
+                "attempts": attempt + 1
+            }
+        )
+    # The wait above already covered completion, so only collect the result without waiting again
+    return win32file.GetOverlappedResult(pipe, overlapped, False)
+
+
+def _check_ack(pipe_string, data):
+    if data == ACK:
+        return True
+    raise PipeError(
+        message=f"Expected ACK but received {data}",
+        error_code=PipeError.UNKNOWN,
+        context={
+            "pipe_name": pipe_string,
+            "expected": ACK,
+            "received": data
+        }
+    )
+
+
+def _open_client(pipe_string, flags, timeout):
+    """Open the client end of a pipe, waiting for a free instance while every instance is busy."""
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+    while True:
+        try:
+            return win32file.CreateFile(
                 pipe_string,
-                win32pipe.PIPE_ACCESS_DUPLEX,
-                win32pipe.PIPE_TYPE_MESSAGE | win32pipe.PIPE_READMODE_MESSAGE | win32pipe.PIPE_WAIT,
-                win32pipe.PIPE_UNLIMITED_INSTANCES,
-                65536,
-                65536,
+                win32con.GENERIC_READ | win32con.GENERIC_WRITE,
                 0,
-                sa
+                None,
+                win32con.OPEN_EXISTING,
+                flags,
+                None
             )
+        except pywintypes.error as e:
+            if e.winerror != winerror.ERROR_PIPE_BUSY:
+                raise
+            if deadline is None:
+                wait_ms = win32pipe.NMPWAIT_WAIT_FOREVER
+            else:
+                wait_ms = int((deadline - time.monotonic()) * 1000)
+                if wait_ms <= 0:
+                    raise
+            try:
+                # Returns as soon as an instance frees up rather than after a fixed sleep
+                win32pipe.WaitNamedPipe(pipe_string, wait_ms)
+            except pywintypes.error:
+                # No instance freed up in time; report the pipe as busy
+                raise e
 
-            # Check if we should still be alive before blocking on connect
-            if not keep_alive:
-                win32file.CloseHandle(pipe)
-                break
 
-            # blocking, awaits a connection
-            win32pipe.ConnectNamedPipe(pipe, None)
+def _send_overlapped():
+    """Return this thread's reusable OVERLAPPED for sends with a timeout, reset for a new operation."""
+    overlapped = getattr(_send_state, 'overlapped', None)
+    if overlapped is None:
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        _send_state.overlapped = overlapped
+    else:
+        win32event.ResetEvent(overlapped.hEvent)
+    return overlapped
 
-            # connection made
-            Thread(target=handle_connection, args=(pipe,), daemon=True).start()
 
-            if max_messages > 0:
-                message_count += 1
-                if message_count >= max_messages:
-                    keep_alive = False
+def _connect(iocp, key, pipe, overlapped):
+    """Arm an overlapped ConnectNamedPipe on a pipe instance; the connection completes on the port."""
+    hr = win32pipe.ConnectNamedPipe(pipe, overlapped)
+    if hr == winerror.ERROR_PIPE_CONNECTED:
+        # A client connected before the connect was armed; no completion packet will be queued
+        win32file.PostQueuedCompletionStatus(iocp, 0, key, overlapped)
 
-        except Exception:
-            raise
+
+def _write(pipe, overlapped, data):
+    """Write data to an overlapped pipe instance and wait for it to complete."""
+    hr, _ = win32file.WriteFile(pipe, data, overlapped)
+    if hr == winerror.ERROR_IO_PENDING:
+        win32file.GetOverlappedResult(pipe, overlapped, True)
+
+
+def _skip_completion_on_success(handle):
+    """Skip the completion packet and handle signal for overlapped I/O on handle that completes inline.
+
+    Returns False if the mode could not be set, in which case every operation still queues a packet.
+    """
+    modes = _FILE_SKIP_COMPLETION_PORT_ON_SUCCESS | _FILE_SKIP_SET_EVENT_ON_HANDLE
+    return bool(_kernel32.SetFileCompletionNotificationModes(int(handle), modes))
+
+
+def _disconnect(pipe):
+    """Disconnect the client from a pipe instance so it can be re-armed."""
+    try:
+        # Let the client read the ACK before the instance is reset
+        win32file.FlushFileBuffers(pipe)
+    except pywintypes.error:
+        pass
+    win32pipe.DisconnectNamedPipe(pipe)
 
 
 def _generate_sa():
@@ -300,29 +614,18 @@ def _generate_sa():
     return sa
 
 
-def _kill_pipe(pipe_name, timeout, die_code, pipe_thread: Thread):
-    start_time = time.time()
-    end_time = start_time + timeout
-
-    # Wait for the timeout period
-    while time.time() < end_time:
-        time.sleep(0.1)
-        # If the thread dies naturally during the timeout, we're done
-        if not pipe_thread.is_alive():
-            return
-
-    # After timeout, try to send die code a few times then give up
-    max_kill_attempts = 3
-    kill_attempt = 0
+# The security attributes never change, so build them once for every listener in the process
+_SA = _generate_sa()
 
-    while pipe_thread.is_alive() and kill_attempt < max_kill_attempts:
-        try:
-            send(pipe_name, die_code, timeout=1, max_attempts=1)  # Short timeout
-            pipe_thread.join(timeout=0.5)  # Give it a moment to process
-            kill_attempt += 1
-        except Exception:
-            # If we can't send the die code, break out
-            break
 
-    # If thread is still alive after attempts, just return and let it be cleaned up
-    # as a daemon thread
+def _kill_pipe(pipe_name, timeout, die_code, pipe_thread: Thread, stop_event: Event):
+    # Returns as soon as the handler exits on its own, otherwise once the timeout elapses
+    if stop_event.wait(timeout):
+        return
+    try:
+        # No ACK needed: the handler raising stop_event is the confirmation
+        send(pipe_name, die_code, timeout=1, max_attempts=3, ack=False)
+    except PipeError:
+        # The handler is already gone or unreachable; let it be cleaned up as a daemon thread
+        return
+    stop_event.wait(5)
@@ -1,26 +1,45 @@
-import platform
+import asyncio
+import sys
 
-os_name = platform.system().lower()
+from ._exceptions import PipeError
 
-if os_name == 'windows':
+# sys.platform is fixed when the interpreter is built, so no uname call is needed
+os_name = sys.platform
+
+if os_name == 'win32':
     from . import _pipecom_win as pc
 elif os_name == 'linux' or os_name == 'darwin':
     from . import _pipecom_posix as pc
+else:
+    class _UnsupportedPlatform():
+        """Stands in for the backend, so importing works and each call reports the platform."""
+
+        def __getattr__(self, name):
+            raise PipeError(f"Named pipes are not supported on platform '{os_name}'", PipeError.UNKNOWN)
+
+    pc = _UnsupportedPlatform()
+
+# Default byte limit for one send_many() write; both backends use the same value
+_MAX_BATCH_BYTES = 1 << 20
 
 
 class Pipe():
 
+    __slots__ = ('pipe_name', 'callback', 'timeout', 'max_messages', 'die_code', 'daemon',
+                 'response_pipe_name', 'pipe', 'message_count', 'buffer_size')
+
     def __init__(self, pipe_name: str, callback: callable, timeout=0, max_messages=0, die_code: str = "PIPECOM_DIE", daemon: bool = True, response_pipe_name: str = None, buffer_size: int = 4096):
         """Initialize a Pipe object.
         Args:
             pipe_name (str): The name of the pipe to listen on.
             callback (callable): Function that runs  when a message is received. Will pass the message as an argument.
+                Runs on a pool of worker threads, so calls can overlap and need not follow the order messages were sent in.
             timeout (int): Time in seconds to wait for a message before giving up. If set to 0, it will wait indefinitely.
             max_messages (int): Maximum number of messages to process before stopping. If set to 0, it will process messages indefinitely.
             die_code (str): A special code that will stop the listener when received. Defaults to "PIPECOM_DIE".
             daemon (bool): If True, the listener will run as a daemon thread and be terminated when the main.
             response_pipe_name (str): The name of the response pipe to send messages back through. If None, no response will be sent.
-            buffer_size (int): (WINDOWS ONLY) Size of the buffer for reading messages from the pipe. Defaults to 4096 bytes.
+            buffer_size (int): Size of the buffer for reading messages from the pipe. Defaults to 4096 bytes.
 
         """
         self.pipe_name = pipe_name
@@ -45,20 +64,218 @@ class Pipe():
         except Exception:
             raise
 
+    async def listen_async(self):
+        """Start listening on a named pipe and wait until the listener stops.
+        The listener runs exactly as with listen(); awaiting it does not block the event loop.
+        Raises:
+            PipeError: If there is an error starting the listener or processing messages.
+        """
+        loop = asyncio.get_running_loop()
+        stopped = loop.create_future()
+
+        def on_stop(error):
+            try:
+                loop.call_soon_threadsafe(_resolve, stopped, error)
+            except RuntimeError:
+                # The event loop closed before the listener stopped
+                pass
+
+        pc.listen(self.pipe_name, self.callback, self.timeout, self.max_messages,
+                  self.die_code, self.daemon, self.response_pipe_name, self.buffer_size, on_stop)
+        await stopped
+
+
+class Connection():
+
+    __slots__ = ('pipe_name', 'timeout')
+
+    def __init__(self, pipe: str | Pipe, timeout: int = 0):
+        """Initialize a Connection object.
+        Args:
+            pipe (str|Pipe): The name of the pipe or a Pipe object to send messages through.
+            timeout (int): Time in seconds each send waits for its message to be sent. If set to 0, it will wait indefinitely.
+
+        """
+        self.pipe_name = pipe.pipe_name if isinstance(pipe, Pipe) else pipe
+        self.timeout = timeout
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return None
+
+    def close(self):
+        """Release the descriptors kept open for the connection's pipe; a later send opens them again.
+        Other connections and send() calls on the same pipe in this process share them too.
+        Raises:
+            PipeError: If the pipe name is invalid.
+        """
+        pc.close(self.pipe_name)
+
+    def send(self, message: str | bytes, max_attempts: int = 0, ack: bool = True) -> bool:
+        """Send a message through the connection's pipe, as send() does.
+        Raises:
+            PipeError: If there is an error sending the message.
+        """
+        return pc.send(self.pipe_name, message, self.timeout, max_attempts, ack)
+
+    async def send_async(self, message: str | bytes, max_attempts: int = 0, ack: bool = True) -> bool:
+        """Send a message through the connection's pipe, as send_async() does.
+        Raises:
+            PipeError: If there is an error sending the message.
+        """
+        return await asyncio.to_thread(pc.send, self.pipe_name, message, self.timeout, max_attempts, ack)
+
+    def send_many(self, messages, max_attempts: int = 0, ack: bool = True, batch_size: int = _MAX_BATCH_BYTES) -> bool:
+        """Send several messages through the connection's pipe, as send_many() does.
+        Raises:
+            PipeError: If there is an error sending the messages.
+        """
+        return pc.send_many(self.pipe_name, messages, self.timeout, max_attempts, ack, batch_size)
+
+
+def connection(pipe: str | Pipe, timeout: int = 0) -> Connection:
+    """Bind a pipe and timeout once for a series of sends, for use in a with block.
+    On POSIX the pipe's descriptors stay open between sends, so a connection's sends share them,
+    and they are closed when the with block ends.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to send messages through.
+        timeout (int): Time in seconds each send waits for its message to be sent. If set to 0, it will wait indefinitely.
+    Returns:
+        Connection: An object whose send() and send_many() methods send through the pipe.
+    """
+    return Connection(pipe, timeout)
+
+
+def _resolve(future, error):
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    elif isinstance(error, PipeError):
+        future.set_exception(error)
+    else:
+        wrapped = PipeError(f"Listener stopped with an error: {error}", PipeError.UNKNOWN)
+        wrapped.__cause__ = error
+        future.set_exception(wrapped)
+
+
+def exists(pipe: str | Pipe) -> bool:
+    """Check whether a listener is running on a named pipe, without sending anything.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to check.
+    Returns:
+        bool: True if a listener is serving the pipe, False otherwise.
+    Raises:
+        PipeError: If the pipe name is invalid or the pipe cannot be checked.
+    """
+    if isinstance(pipe, Pipe):
+        pipe = pipe.pipe_name
+    try:
+        return pc.exists(pipe)
+    except:
+        raise
+
 
-def send(pipe: str | Pipe, message: str, timeout: int = 0, max_attempts: int = 0) -> bool:
+def send(pipe: str | Pipe, message: str | bytes, timeout: int = 0, max_attempts: int = 0, ack: bool = True) -> bool:
     """Send a message through a named pipe.
     Args:
         pipe (str|Pipe): The name of the pipe or a Pipe object to send the message through.
-        message (str): The message to send.
+        message (str|bytes): The message to send. Bytes must be UTF-8 and are sent without re-encoding.
+        timeout (int): Time in seconds to wait for the message to be sent. If set to 0, it will wait indefinitely.
+        max_attempts (int): Maximum number of attempts to send the message. If set to 0, it will attempt indefinitely.
+        ack (bool): Whether to wait for the listener to acknowledge the message. If False, returns once the message is written.
+    Returns:
+        bool: True if the message was sent and acknowledged (or just written, when ack is False), False otherwise.
+    Raises:
+        PipeError: If there is an error sending the message.
+    """
+    if isinstance(pipe, Pipe):
+        pipe = pipe.pipe_name
+    try:
+        return pc.send(pipe, message, timeout, max_attempts, ack)
+    except:
+        raise
+
+
+async def send_async(pipe: str | Pipe, message: str | bytes, timeout: int = 0, max_attempts: int = 0, ack: bool = True) -> bool:
+    """Send a message through a named pipe without blocking the event loop.
+    The send runs exactly as with send(), on the event loop's default executor, so many
+    coroutines can have sends in flight at once. Sends to the same pipe still take turns
+    on the pipe itself, so their frames never interleave.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to send the message through.
+        message (str|bytes): The message to send. Bytes must be UTF-8 and are sent without re-encoding.
+        timeout (int): Time in seconds to wait for the message to be sent. If set to 0, it will wait indefinitely.
+        max_attempts (int): Maximum number of attempts to send the message. If set to 0, it will attempt indefinitely.
+        ack (bool): Whether to wait for the listener to acknowledge the message. If False, returns once the message is written.
+    Returns:
+        bool: True if the message was sent and acknowledged (or just written, when ack is False), False otherwise.
+    Raises:
+        PipeError: If there is an error sending the message.
+    """
+    return await asyncio.to_thread(send, pipe, message, timeout, max_attempts, ack)
+
+
+def try_send(pipe: str | Pipe, message: str | bytes, timeout: int = 0, max_attempts: int = 0, ack: bool = True) -> tuple[bool, str | None]:
+    """Send a message like send(), but report a failure instead of raising it.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to send the message through.
+        message (str|bytes): The message to send. Bytes must be UTF-8 and are sent without re-encoding.
+        timeout (int): Time in seconds to wait for the message to be sent. If set to 0, it will wait indefinitely.
+        max_attempts (int): Maximum number of attempts to send the message. If set to 0, it will attempt indefinitely.
+        ack (bool): Whether to wait for the listener to acknowledge the message. If False, returns once the message is written.
+    Returns:
+        tuple: (ok, error_code), where ok is send()'s result and error_code is the PipeError code
+            of the failure, or None if no PipeError was raised.
+    """
+    try:
+        return send(pipe, message, timeout, max_attempts, ack), None
+    except PipeError as e:
+        return False, e.error_code
+
+
+def send_many(pipe: str | Pipe, messages, timeout: int = 0, max_attempts: int = 0, ack: bool = True, batch_size: int = _MAX_BATCH_BYTES) -> bool:
+    """Send several messages through a named pipe, coalescing them into as few writes as possible.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to send the messages through.
+        messages (iterable of str|bytes): The messages to send. Each one reaches the callback on its own, and the
+            callbacks may run concurrently and in any order.
+        timeout (int): Time in seconds to wait for all of the messages to be sent. If set to 0, it will wait indefinitely.
+        max_attempts (int): Maximum number of attempts to send each message. If set to 0, it will attempt indefinitely.
+        ack (bool): Whether to wait for the listener to acknowledge every message. If False, returns once the messages are written.
+        batch_size (int): Maximum number of bytes to write at once. If set to 0, every message is written on its own.
+    Returns:
+        bool: True if every message was sent and acknowledged (or just written, when ack is False), False otherwise.
+    Raises:
+        PipeError: If there is an error sending the messages.
+    """
+    if isinstance(pipe, Pipe):
+        pipe = pipe.pipe_name
+    try:
+        return pc.send_many(pipe, messages, timeout, max_attempts, ack, batch_size)
+    except:
+        raise
+
+
+def sendv(pipe: str | Pipe, buffers, timeout: int = 0, max_attempts: int = 0, ack: bool = True) -> bool:
+    """Send a message made of several byte buffers through a named pipe, without joining them first.
+    Args:
+        pipe (str|Pipe): The name of the pipe or a Pipe object to send the message through.
+        buffers (iterable of bytes-like): The pieces of the message, in order. Together they must be valid UTF-8.
         timeout (int): Time in seconds to wait for the message to be sent. If set to 0, it will wait indefinitely.
         max_attempts (int): Maximum number of attempts to send the message. If set to 0, it will attempt indefinitely.
+        ack (bool): Whether to wait for the listener to acknowledge the message. If False, returns once the message is written.
     Returns:
-        bool: True if the message was sent and acknowledged, False otherwise.
+        bool: True if the message was sent and acknowledged (or just written, when ack is False), False otherwise.
     Raises:
         PipeError: If there is an error sending the message.
     """
+    if isinstance(pipe, Pipe):
+        pipe = pipe.pipe_name
     try:
-        return pc.send(pipe, message, timeout, max_attempts)
+        return pc.sendv(pipe, buffers, timeout, max_attempts, ack)
     except:
         raise
@@ -8,75 +8,356 @@ except Exception:
 
 import pipecom
 from pipecom import PipeError
+import array
+import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import functools
+import io
+import itertools
+import platform
 import time
 import threading
 import unittest
 
+# Callback timestamps are only compared with each other, so use the monotonic clock
+_now = time.monotonic_ns
+
+# Client threads reused by every test that fans sends out
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='test-client')
+atexit.register(_EXECUTOR.shutdown)
+
+
+def wait_for_listener(pipe_name, timeout=5):
+    """Block until the listener for pipe_name has created its pipe."""
+    deadline = time.monotonic() + timeout
+    while not pipecom.exists(pipe_name):
+        if time.monotonic() >= deadline:
+            raise AssertionError(f"Listener on '{pipe_name}' did not start within {timeout}s")
+        time.sleep(0.001)
+
+
+def stop_listener(pipe_name):
+    """Send the default die code to pipe_name, ignoring a listener that is already gone."""
+    try:
+        pipecom.send(pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
+    except Exception:
+        pass
+
 
 class TestPipecom(unittest.TestCase):
     """Comprehensive test suite for pipecom library."""
 
+    # One listener serves every test that just needs a plain pipe; messages are
+    # prefixed with "<test name>|" and routed back to the test that sent them
+    shared_pipe_name = f"shared_test_pipe_{os.getpid()}"
+    _active_tests = {}
+    # Numbers each test's own pipe name; unlike a clock-derived name it cannot collide.
+    # Pipe names also carry the PID so parallel test processes never share a pipe.
+    _name_counter = itertools.count()
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the shared listener once for the whole class."""
+        cls.shared_pipe = pipecom.Pipe(cls.shared_pipe_name, cls._dispatch_callback)
+        cls.shared_pipe.listen()
+        wait_for_listener(cls.shared_pipe_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the shared listener."""
+        stop_listener(cls.shared_pipe_name)
+
+    @classmethod
+    def _dispatch_callback(cls, message):
+        """Hand a shared-pipe message to the callback of the test that sent it."""
+        route, _, payload = message.partition('|')
+        test = cls._active_tests.get(route)
+        if test is not None:
+            return test.message_callback(payload)
+
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.test_pipe_name = f"test_pipe_{int(time.time() * 1000) % 10000}"  # Unique pipe name
+        self.test_pipe_name = f"test_pipe_{os.getpid()}_{next(type(self)._name_counter)}"  # Unique pipe name
         self.messages_received = []
         self.callbacks_executed = []
+        # Notified whenever message_callback records a message
+        self._received = threading.Condition()
+        # Callback output is collected here and written out in one go at tearDown
+        self._log = io.StringIO()
+        # Listeners this test started that tearDown still has to stop
+        self._listeners = []
+        self._active_tests[self._testMethodName] = self
 
     def tearDown(self):
         """Clean up after each test method."""
-        # Send die code to stop any listening pipes
-        try:
-            pipecom.send(self.test_pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
-        except Exception:
-            pass
-        time.sleep(0.1)  # Give time for cleanup
+        self._active_tests.pop(self._testMethodName, None)
+        sys.stdout.write(self._log.getvalue())
+        # Only listeners this test started need a die code; the shared one outlives it
+        for pipe_name in self._listeners:
+            stop_listener(pipe_name)
+
+    def start_listener(self, pipe, stop_in_teardown=True):
+        """Start a listener and wait until it is up; tearDown stops it unless the test stops it itself."""
+        pipe.listen()
+        if stop_in_teardown:
+            self._listeners.append(pipe.pipe_name)
+        wait_for_listener(pipe.pipe_name)
+
+    def route(self, message):
+        """Prefix a message so the shared listener delivers it to this test."""
+        return f"{self._testMethodName}|{message}"
 
     def message_callback(self, message):
         """Callback function that records received messages."""
-        decoded_msg = message.decode('utf-8') if isinstance(message, bytes) else str(message)
-        self.messages_received.append(decoded_msg)
-        self.callbacks_executed.append(time.time())
-        print(f"Received: {decoded_msg}")
-        return f"ACK: {decoded_msg}"
+        with self._received:
+            self.messages_received.append(message)
+            self.callbacks_executed.append(_now())
+            self._received.notify_all()
+        self._log.write(f"Received: {message}\n")
+        return f"ACK: {message}"
+
+    def wait_for_messages(self, count, timeout=5):
+        """Block until message_callback has recorded at least count messages."""
+        with self._received:
+            return self._received.wait_for(lambda: len(self.messages_received) >= count, timeout=timeout)
 
     def test_basic_send_receive(self):
         """Test basic message sending and receiving."""
         print("\n=== Testing Basic Send/Receive ===")
 
-        # Start listener
-        pipe = pipecom.Pipe(self.test_pipe_name, self.message_callback)
-        pipe.listen()
-
-        time.sleep(0.2)  # Allow listener to start
-
         # Send message
         test_message = "Hello, World!"
-        result = pipecom.send(self.test_pipe_name, test_message, timeout=5, max_attempts=3)
+        result = pipecom.send(self.shared_pipe_name, self.route(test_message), timeout=5, max_attempts=3)
+
+        self.wait_for_messages(1)
+
+        self.assertTrue(result, "Message should be sent successfully")
+        self.assertIn(test_message, self.messages_received, "Message should be received by callback")
+
+    def test_send_to_pipe_object(self):
+        """Test sending through a Pipe object instead of a pipe name."""
+        print("\n=== Testing Send To Pipe Object ===")
+
+        result = pipecom.send(self.shared_pipe, self.route("Hello, Pipe!"), timeout=5, max_attempts=3)
 
-        time.sleep(0.1)  # Allow processing
+        self.wait_for_messages(1)
 
         self.assertTrue(result, "Message should be sent successfully")
-        self.assertIn(test_message, str(self.messages_received), "Message should be received by callback")
+        self.assertIn("Hello, Pipe!", self.messages_received, "Message should be received by callback")
+
+    def test_listen_async(self):
+        """Test awaiting a listener until it stops."""
+        print("\n=== Testing Async Listen ===")
+
+        async def run():
+            pipe = pipecom.Pipe(self.test_pipe_name, self.message_callback, max_messages=2)
+            listening = asyncio.create_task(pipe.listen_async())
+
+            await asyncio.to_thread(wait_for_listener, self.test_pipe_name)
+
+            for msg in ["Async 1", "Async 2"]:
+                result = await asyncio.to_thread(pipecom.send, self.test_pipe_name, msg, timeout=5, max_attempts=3)
+                self.assertTrue(result, f"Message '{msg}' should be sent successfully")
+
+            # The listener stops on its own after max_messages
+            await asyncio.wait_for(listening, timeout=5)
+
+        asyncio.run(run())
+
+        for msg in ["Async 1", "Async 2"]:
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_send_async(self):
+        """Test awaiting several sends at once."""
+        print("\n=== Testing Async Send ===")
+
+        messages = ["Await 1", "Await 2", "Await 3"]
+
+        async def run():
+            with pipecom.connection(self.shared_pipe_name, timeout=5) as conn:
+                return await asyncio.gather(
+                    pipecom.send_async(self.shared_pipe_name, self.route(messages[0]), timeout=5, max_attempts=3),
+                    *(conn.send_async(self.route(msg), max_attempts=3) for msg in messages[1:]))
+
+        results = asyncio.run(run())
+        self.wait_for_messages(len(messages))
+
+        self.assertEqual(results, [True] * len(messages), "Messages should be sent successfully")
+        for msg in messages:
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_listen_async_failure(self):
+        """Test that a listener failing to start raises from listen_async()."""
+        print("\n=== Testing Async Listen Failure ===")
+
+        # A pipe under a directory that does not exist can never be created
+        pipe_name = os.path.join(f"missing_dir_{os.getpid()}", "pipe") if platform.system().lower() != 'windows' \
+            else f"\\{self.test_pipe_name}"
+        pipe = pipecom.Pipe(pipe_name, self.message_callback)
+
+        async def run():
+            await asyncio.wait_for(pipe.listen_async(), timeout=5)
+
+        with self.assertRaises(PipeError):
+            asyncio.run(run())
+
+    def test_partial_callback_failure(self):
+        """Test that a failing callback without a __name__ is reported and the listener keeps serving."""
+        print("\n=== Testing Partial Callback Failure ===")
+
+        def failing_callback(errors, message):
+            if message in errors:
+                raise errors[message](message)
+            return self.message_callback(message)
+
+        # A ValueError is reported through a PipeError and its lazy context, a RuntimeError directly
+        callback = functools.partial(failing_callback, {"value": ValueError, "runtime": RuntimeError})
+        pipe = pipecom.Pipe(self.test_pipe_name, callback)
+        self.start_listener(pipe)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            for msg in ("value", "runtime"):
+                # A failed callback sends no ACK, so do not wait for one
+                self.assertTrue(pipecom.send(self.test_pipe_name, msg, timeout=5, max_attempts=3, ack=False))
+            self.assertTrue(pipecom.send(self.test_pipe_name, "ok", timeout=5, max_attempts=3),
+                            "Listener should keep serving after failed callbacks")
+            self.wait_for_messages(1)
+            deadline = time.monotonic() + 5
+            while output.getvalue().count("Warning:") < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(self.messages_received, ["ok"])
+        self.assertEqual(output.getvalue().count("functools.partial("), 2,
+                         f"Both failures should be reported with the callback's repr: {output.getvalue()!r}")
 
     def test_multiple_messages(self):
         """Test sending multiple messages."""
         print("\n=== Testing Multiple Messages ===")
 
-        pipe = pipecom.Pipe(self.test_pipe_name, self.message_callback)
-        pipe.listen()
-
-        time.sleep(0.2)
-
         messages = ["Message 1", "Message 2", "Message 3"]
         for msg in messages:
-            result = pipecom.send(self.test_pipe_name, msg, timeout=5, max_attempts=3)
+            result = pipecom.send(self.shared_pipe_name, self.route(msg), timeout=5, max_attempts=3)
             self.assertTrue(result, f"Message '{msg}' should be sent successfully")
-            time.sleep(0.1)
 
-        time.sleep(0.2)  # Allow all messages to be processed
+        self.wait_for_messages(len(messages))
 
         for msg in messages:
-            self.assertIn(msg, str(self.messages_received), f"Message '{msg}' should be received")
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_send_bytes(self):
+        """Test sending an already encoded message."""
+        print("\n=== Testing Send Bytes ===")
+
+        result = pipecom.send(self.shared_pipe_name, self.route("Caf\u00e9").encode('utf-8'), timeout=5, max_attempts=3)
+
+        self.wait_for_messages(1)
+
+        self.assertTrue(result, "Message should be sent successfully")
+        self.assertIn("Caf\u00e9", self.messages_received, "Bytes should arrive decoded as UTF-8")
+
+    def test_try_send(self):
+        """Test sending without raising on failure."""
+        print("\n=== Testing Try Send ===")
+
+        ok, error_code = pipecom.try_send(self.shared_pipe_name, self.route("Tried"), timeout=5, max_attempts=3)
+        self.wait_for_messages(1)
+        self.assertEqual((ok, error_code), (True, None), "Message should be sent successfully")
+        self.assertIn("Tried", self.messages_received, "Message should be received by callback")
+
+        ok, error_code = pipecom.try_send("", "test", timeout=1, max_attempts=1)
+        self.assertEqual((ok, error_code), (False, PipeError.INVALID_PIPE_NAME), "Invalid name should be reported")
+
+    def test_send_many(self):
+        """Test sending a batch of messages in one call."""
+        print("\n=== Testing Send Many ===")
+
+        messages = ["Batch 1", "Batch 2", "Batch 3"]
+        result = pipecom.send_many(self.shared_pipe_name, [self.route(msg) for msg in messages], timeout=5, max_attempts=3)
+        self.assertTrue(result, "Batch should be sent successfully")
+
+        # A batch_size of 0 writes every message on its own
+        result = pipecom.send_many(self.shared_pipe_name, [self.route("Batch 4")], timeout=5, max_attempts=3, batch_size=0)
+        self.assertTrue(result, "Unbatched message should be sent successfully")
+
+        self.wait_for_messages(len(messages) + 1)
+
+        for msg in messages + ["Batch 4"]:
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_sendv(self):
+        """Test sending one message made of several buffers."""
+        print("\n=== Testing Sendv ===")
+
+        buffers = [self.route("Vector ").encode('utf-8'), b"message"]
+        result = pipecom.sendv(self.shared_pipe_name, buffers, timeout=5, max_attempts=3)
+
+        self.wait_for_messages(1)
+
+        self.assertTrue(result, "Message should be sent successfully")
+        self.assertEqual(self.messages_received, ["Vector message"], "Buffers should arrive as one message")
+
+    def test_sendv_wide_items(self):
+        """Test that buffers with items wider than a byte are framed by their byte length."""
+        print("\n=== Testing Sendv With Wide Items ===")
+
+        # Each 16-bit item repeats one byte, so the payload reads the same on either byte order
+        buffers = [self.route("Wide ").encode('utf-8'), memoryview(array.array('H', [0x6363, 0x6464]))]
+        self.assertTrue(pipecom.sendv(self.shared_pipe_name, buffers, timeout=5, max_attempts=3),
+                        "Message should be sent successfully")
+        # A miscounted frame would leave the pipe out of step, so a following send would fail
+        self.assertTrue(pipecom.send(self.shared_pipe_name, self.route("After wide"), timeout=5, max_attempts=3),
+                        "Follow-up message should be sent successfully")
+
+        self.wait_for_messages(2)
+
+        self.assertEqual(sorted(self.messages_received), ["After wide", "Wide ccdd"],
+                         "Wide buffers should arrive as their full bytes")
+
+    def test_connection(self):
+        """Test sending a series of messages through one connection."""
+        print("\n=== Testing Connection ===")
+
+        messages = ["Conn 1", "Conn 2", "Conn 3", "Conn 4"]
+        with pipecom.connection(self.shared_pipe, timeout=5) as conn:
+            for msg in messages[:2]:
+                self.assertTrue(conn.send(self.route(msg), max_attempts=3), f"Message '{msg}' should be sent successfully")
+            self.assertTrue(conn.send_many([self.route(messages[2])], max_attempts=3), "Batch should be sent successfully")
+        # Leaving the block closed the pipe's descriptors; the next send opens them again
+        self.assertTrue(pipecom.send(self.shared_pipe, self.route(messages[3]), timeout=5, max_attempts=3),
+                        "Send after the connection closed should succeed")
+
+        self.wait_for_messages(len(messages))
+
+        for msg in messages:
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_fire_and_forget(self):
+        """Test sending messages without waiting for an acknowledgment."""
+        print("\n=== Testing Fire-and-Forget ===")
+
+        messages = ["Event 1", "Event 2", "Event 3"]
+        for msg in messages:
+            result = pipecom.send(self.shared_pipe_name, self.route(msg), timeout=5, max_attempts=3, ack=False)
+            self.assertTrue(result, f"Message '{msg}' should be written successfully")
+
+        # An acknowledged send after them proves the listener is still in sync
+        self.assertTrue(pipecom.send(self.shared_pipe_name, self.route("Event 4"), timeout=5, max_attempts=3))
+
+        self.wait_for_messages(len(messages) + 1)
+
+        for msg in messages + ["Event 4"]:
+            self.assertIn(msg, self.messages_received, f"Message '{msg}' should be received")
+
+    def test_exists(self):
+        """Test probing for a listener without sending to it."""
+        print("\n=== Testing Exists ===")
+
+        self.assertTrue(pipecom.exists(self.shared_pipe_name), "Shared listener should be found")
+        self.assertTrue(pipecom.exists(self.shared_pipe), "Shared listener should be found through its Pipe object")
+        self.assertFalse(pipecom.exists(self.test_pipe_name), "Pipe without a listener should not be found")
 
     def test_timeout_handling(self):
         """Test timeout scenarios."""
@@ -87,12 +368,12 @@ class TestPipecom(unittest.TestCase):
             time.sleep(3)
 
         # Start listener
-        pipe = pipecom.Pipe("slow_pipe", slow_callback)
-        pipe.listen()
+        pipe = pipecom.Pipe(self.test_pipe_name + "_slow", slow_callback)
+        self.start_listener(pipe)
 
         # Try to send to unresponsive pipe with short timeout
         with self.assertRaises(PipeError) as context:
-            pipecom.send("slow_pipe", "test", timeout=1, max_attempts=1)
+            pipecom.send(pipe.pipe_name, "test", timeout=1, max_attempts=1)
 
         print(f"Expected timeout error: {context.exception}")
 
@@ -108,15 +389,14 @@ class TestPipecom(unittest.TestCase):
             die_code=custom_die_code,
             max_messages=3  # Allow for 2 messages + die code
         )
-        pipe.listen()
-
-        time.sleep(0.2)
+        # The custom die code at the end stops this listener
+        self.start_listener(pipe, stop_in_teardown=False)
 
         # Send messages
         result1 = pipecom.send(pipe.pipe_name, "Message 1", timeout=5, max_attempts=3)
         result2 = pipecom.send(pipe.pipe_name, "Message 2", timeout=5, max_attempts=3)
 
-        time.sleep(0.2)
+        self.wait_for_messages(2)
 
         # Send custom die code
         result3 = pipecom.send(pipe.pipe_name, custom_die_code, timeout=5, max_attempts=3)
@@ -131,8 +411,6 @@ class TestPipecom(unittest.TestCase):
         print("\n=== Testing Error Handling ===")
 
         # Test invalid pipe name scenarios - different validation for different platforms
-        import platform
-
         # These should be invalid on all platforms
         always_invalid_names = ["", " "]
 
@@ -154,16 +432,12 @@ class TestPipecom(unittest.TestCase):
         if platform.system().lower() != 'windows':
             try:
                 # This should work on POSIX systems
-                path_pipe_name = "/tmp/test_path_pipe"
+                path_pipe_name = f"/tmp/test_path_pipe_{os.getpid()}"
                 pipe = pipecom.Pipe(path_pipe_name, self.message_callback)
-                pipe.listen()
-                time.sleep(0.1)
+                self.start_listener(pipe)
 
                 result = pipecom.send(path_pipe_name, "Path test", timeout=2, max_attempts=2)
                 print(f"Path-based pipe test result: {result}")
-
-                # Clean up
-                pipecom.send(path_pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
             except Exception as e:
                 print(f"Unexpected error with path-based pipe: {e}")
 
@@ -171,36 +445,54 @@ class TestPipecom(unittest.TestCase):
         """Test multiple clients sending to the same pipe."""
         print("\n=== Testing Concurrent Clients ===")
 
-        pipe = pipecom.Pipe(self.test_pipe_name, self.message_callback)
-        pipe.listen()
-
-        time.sleep(0.2)
-
         def send_messages(client_id, count):
             for i in range(count):
                 msg = f"Client {client_id} - Message {i+1}"
                 try:
-                    result = pipecom.send(self.test_pipe_name, msg, timeout=5, max_attempts=3)
+                    result = pipecom.send(self.shared_pipe_name, self.route(msg), timeout=5, max_attempts=3)
                     print(f"Client {client_id} sent: {msg} - Success: {result}")
-                    time.sleep(0.05)
                 except Exception as e:
                     print(f"Client {client_id} error: {e}")
 
-        # Start multiple client threads
-        threads = []
-        for client_id in range(3):
-            thread = threading.Thread(target=send_messages, args=(client_id, 2))
-            threads.append(thread)
-            thread.start()
+        async def send_all():
+            # Submit every client at once and wait for all of them together
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(_EXECUTOR, send_messages, client_id, 2)
+                                   for client_id in range(3)])
 
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        asyncio.run(send_all())
 
-        time.sleep(0.3)  # Allow all messages to be processed
+        self.wait_for_messages(6)
 
         print(f"Total messages received: {len(self.messages_received)}")
 
+    def test_concurrent_large_batches(self):
+        """Test concurrent batches whose frames are far larger than one atomic pipe write."""
+        print("\n=== Testing Concurrent Large Batches ===")
+
+        received = []
+        lock = threading.Lock()
+
+        def record(message):
+            # The payloads are too large to log, so keep only what identifies them
+            with lock:
+                received.append((message[0], len(message), len(set(message))))
+
+        self.start_listener(pipecom.Pipe(self.test_pipe_name, record))
+
+        clients = "abcd"
+        futures = [_EXECUTOR.submit(pipecom.send_many, self.test_pipe_name, [c * 200000] * 5, timeout=10)
+                   for c in clients]
+        for future in futures:
+            self.assertTrue(future.result(), "Every batch should be sent and acknowledged")
+
+        # The listener must still be in step with the stream afterwards
+        self.assertTrue(pipecom.send(self.test_pipe_name, "hello", timeout=5))
+
+        self.assertEqual(len(received), len(clients) * 5 + 1, "Every message should reach the callback")
+        self.assertEqual(sorted(r for r in received if r[1] != 5), sorted((c, 200000, 1) for c in clients for _ in range(5)),
+                         "No message should contain bytes from another")
+
     def test_response_pipe_functionality(self):
         """Test response pipe functionality for bidirectional communication."""
         print("\n=== Testing Response Pipe Functionality ===")
@@ -208,22 +500,25 @@ class TestPipecom(unittest.TestCase):
         # Track messages received on both pipes
         main_messages = []
         response_messages = []
+        received = threading.Condition()
 
         def main_callback(message):
             """Main pipe callback that processes requests and returns responses."""
-            decoded_msg = message.decode('utf-8') if isinstance(message, bytes) else str(message)
-            main_messages.append(decoded_msg)
-            print(f"Main pipe received: {decoded_msg}")
+            with received:
+                main_messages.append(message)
+                received.notify_all()
+            print(f"Main pipe received: {message}")
 
             # Return a response that will be sent to the response pipe
-            return f"Processed: {decoded_msg}"
+            return f"Processed: {message}"
 
         def response_callback(message):
             """Response pipe callback that receives the processed results."""
-            decoded_msg = message.decode('utf-8') if isinstance(message, bytes) else str(message)
-            response_messages.append(decoded_msg)
-            print(f"Response pipe received: {decoded_msg}")
-            return f"Response ACK: {decoded_msg}"
+            with received:
+                response_messages.append(message)
+                received.notify_all()
+            print(f"Response pipe received: {message}")
+            return f"Response ACK: {message}"
 
         # Create main pipe (without response_pipe_name for now)
         main_pipe_name = f"{self.test_pipe_name}_main"
@@ -231,15 +526,11 @@ class TestPipecom(unittest.TestCase):
 
         # Start the response pipe listener first
         response_pipe = pipecom.Pipe(response_pipe_name, response_callback)
-        response_pipe.listen()
-
-        time.sleep(0.2)  # Allow response pipe to start
+        self.start_listener(response_pipe)
 
         # Start the main pipe listener with response_pipe_name configured
         main_pipe = pipecom.Pipe(main_pipe_name, main_callback, response_pipe_name=response_pipe_name)
-        main_pipe.listen()
-
-        time.sleep(0.2)  # Allow main pipe to start
+        self.start_listener(main_pipe)
 
         # Send test messages to the main pipe
         test_messages = ["Request 1", "Request 2", "Request 3"]
@@ -248,9 +539,10 @@ class TestPipecom(unittest.TestCase):
             print(f"Sending to main pipe: {msg}")
             result = pipecom.send(main_pipe_name, msg, timeout=5, max_attempts=3)
             self.assertTrue(result, f"Message '{msg}' should be sent successfully to main pipe")
-            time.sleep(0.2)  # Allow processing time
 
-        time.sleep(0.5)  # Allow all messages to be processed
+        # Responses are forwarded after the main pipe has acknowledged each request
+        with received:
+            received.wait_for(lambda: len(response_messages) >= len(test_messages), timeout=5)
 
         # Verify messages were received on both pipes
         print(f"Main pipe received {len(main_messages)} messages: {main_messages}")
@@ -266,29 +558,20 @@ class TestPipecom(unittest.TestCase):
             self.assertIn(expected_response, response_messages,
                           f"Response '{expected_response}' should be received on response pipe")
 
-        # Clean up both pipes
-        try:
-            pipecom.send(main_pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
-        except Exception:
-            pass
-
-        try:
-            pipecom.send(response_pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
-        except Exception:
-            pass
-
     def test_response_pipe_error_handling(self):
         """Test response pipe error handling when response pipe is unavailable."""
         print("\n=== Testing Response Pipe Error Handling ===")
 
         main_messages = []
+        received = threading.Condition()
 
         def error_prone_callback(message):
             """Callback that tries to send to non-existent response pipe."""
-            decoded_msg = message.decode('utf-8') if isinstance(message, bytes) else str(message)
-            main_messages.append(decoded_msg)
-            print(f"Main pipe received: {decoded_msg}")
-            return f"Response: {decoded_msg}"
+            with received:
+                main_messages.append(message)
+                received.notify_all()
+            print(f"Main pipe received: {message}")
+            return f"Response: {message}"
 
         # Create main pipe with non-existent response pipe
         main_pipe_name = f"{self.test_pipe_name}_error_main"
@@ -300,9 +583,7 @@ class TestPipecom(unittest.TestCase):
             error_prone_callback,
             response_pipe_name=nonexistent_response_pipe
         )
-        main_pipe.listen()
-
-        time.sleep(0.2)
+        self.start_listener(main_pipe)
 
         # Send a message - this should still work even if response pipe fails
         test_message = "Test message for error handling"
@@ -315,18 +596,13 @@ class TestPipecom(unittest.TestCase):
         except Exception as e:
             print(f"Expected error when response pipe is unavailable: {e}")
 
-        time.sleep(0.2)
+        with received:
+            received.wait_for(lambda: main_messages, timeout=5)
 
         # Verify the main message was still received
         self.assertIn(test_message, main_messages,
                       "Main message should be received even if response pipe fails")
 
-        # Clean up
-        try:
-            pipecom.send(main_pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
-        except Exception:
-            pass
-
 
 def run_interactive_test():
     """Run an interactive test for manual verification."""
@@ -335,19 +611,21 @@ def run_interactive_test():
     print("="*50)
 
     messages_received = []
+    # Set once the callback has printed a message, so the next send waits for it instead of sleeping
+    ack_event = threading.Event()
 
     def interactive_callback(message):
-        decoded_msg = message.decode('utf-8') if isinstance(message, bytes) else str(message)
-        messages_received.append(decoded_msg)
-        print(f"📨 Received: {decoded_msg}")
-        return f"ACK: {decoded_msg}"
+        messages_received.append(message)
+        print(f"📨 Received: {message}")
+        ack_event.set()
+        return f"ACK: {message}"
 
     # Start listener
     print("🚀 Starting pipe listener...")
     pipe = pipecom.Pipe("interactive_test", interactive_callback)
     pipe.listen()
 
-    time.sleep(0.2)
+    wait_for_listener("interactive_test")
 
     print("✅ Listener started. You can now run test2.py in another terminal")
     print("💡 Or send messages programmatically...")
@@ -367,7 +645,8 @@ def run_interactive_test():
             print(f"✅ Send result: {result}")
         except Exception as e:
             print(f"❌ Send error: {e}")
-        time.sleep(1)
+        ack_event.wait(timeout=2)
+        ack_event.clear()
 
     print(f"\n📊 Summary: Sent {len(test_messages)} messages, Received {len(messages_received)} messages")
 
@@ -1,23 +1,54 @@
+import importlib.util
 import sys
 import os
 
-try:
+# Only fall back to the source tree when pipecom is not installed (e.g. with pip install -e .)
+if importlib.util.find_spec('pipecom') is None:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-except Exception:
-    pass
 
 from pipecom import pipecom
 from pipecom._exceptions import PipeError
+import asyncio
+import concurrent.futures
+import functools
 import time
 import json
+from dataclasses import dataclass
 
+# Compact output keeps the JSON test's payload free of indentation whitespace
+_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
 
-def test_basic_send():
+# Only the JSON test's timestamp changes between runs, so everything around it is encoded once
+_JSON_PREFIX = _ENCODER.encode({"type": "test_message"})[:-1] + ',"timestamp":'
+_JSON_SUFFIX = ',"payload":' + _ENCODER.encode({
+    "user": "test_user",
+    "action": "send_data",
+    "data": [1, 2, 3, 4, 5]
+}) + '}'
+
+_LARGE_PREFIX = b"LARGE_MESSAGE:"
+
+# The tests main() runs side by side each send to their own pipe; the ordered tests share 'simple'
+_PARALLEL_PIPES = {
+    "Basic Send": "simple_basic",
+    "JSON Message": "simple_json",
+    "Large Message": "simple_large",
+    "Error Conditions": "simple_errors",
+}
+
+
+@functools.cache
+def lorem_bytes(repeat):
+    """Return the large-message body for a repeat count, built and encoded only once per count."""
+    return b"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * repeat
+
+
+def test_basic_send(pipe_name='simple'):
     """Test basic message sending functionality."""
     print("=== Basic Send Test ===")
 
     try:
-        result = pipecom.send('simple', 'Hello World', timeout=5, max_attempts=3)
+        result = pipecom.send(pipe_name, 'Hello World', timeout=5, max_attempts=3)
         print(f"✅ Message sent successfully: {result}")
         return True
     except PipeError as e:
@@ -39,42 +70,34 @@ def test_multiple_sends():
         "Final message"
     ]
 
+    # One write for the whole listing rather than one print per message
+    print("\n".join(f"Sending message {i}: {msg}" for i, msg in enumerate(messages, 1)))
+
     success_count = 0
-    for i, msg in enumerate(messages, 1):
-        try:
-            print(f"Sending message {i}: {msg}")
-            result = pipecom.send('simple', msg, timeout=5, max_attempts=3)
-            if result:
-                print(f"✅ Message {i} sent successfully")
-                success_count += 1
-            else:
-                print(f"❌ Message {i} failed to send")
-            time.sleep(0.5)  # Small delay between messages
-        except Exception as e:
-            print(f"❌ Error sending message {i}: {e}")
+    # The connection binds the pipe and timeout once for every send in the sequence
+    with pipecom.connection('simple', timeout=5) as conn:
+        for i, msg in enumerate(messages, 1):
+            try:
+                if conn.send(msg, max_attempts=3):
+                    print(f"✅ Message {i} sent successfully")
+                    success_count += 1
+                else:
+                    print(f"❌ Message {i} failed to send")
+            except Exception as e:
+                print(f"❌ Error sending message {i}: {e}")
 
     print(f"\n📊 Results: {success_count}/{len(messages)} messages sent successfully")
     return success_count == len(messages)
 
 
-def test_json_message():
+def test_json_message(pipe_name='simple'):
     """Test sending JSON data."""
     print("\n=== JSON Message Test ===")
 
-    data = {
-        "type": "test_message",
-        "timestamp": time.time(),
-        "payload": {
-            "user": "test_user",
-            "action": "send_data",
-            "data": [1, 2, 3, 4, 5]
-        }
-    }
-
     try:
-        json_message = json.dumps(data, indent=2)
+        json_message = f"{_JSON_PREFIX}{_ENCODER.encode(time.time())}{_JSON_SUFFIX}"
         print(f"Sending JSON: {json_message}")
-        result = pipecom.send('simple', json_message, timeout=5, max_attempts=3)
+        result = pipecom.send(pipe_name, json_message, timeout=5, max_attempts=3)
         print(f"✅ JSON message sent successfully: {result}")
         return True
     except Exception as e:
@@ -82,17 +105,15 @@ def test_json_message():
         return False
 
 
-def test_large_message():
+def test_large_message(pipe_name='simple'):
     """Test sending a large message."""
     print("\n=== Large Message Test ===")
 
-    # Create a large message (about 1KB)
-    large_text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
-    large_message = f"LARGE_MESSAGE:{large_text}"
-
+    body = lorem_bytes(20)
     try:
-        print(f"Sending large message ({len(large_message)} characters)...")
-        result = pipecom.send('simple', large_message, timeout=10, max_attempts=3)
+        print(f"Sending large message ({len(_LARGE_PREFIX) + len(body)} characters)...")
+        # The prefix and the cached body go out as one message without being concatenated
+        result = pipecom.sendv(pipe_name, [_LARGE_PREFIX, memoryview(body)], timeout=10, max_attempts=3)
         print(f"✅ Large message sent successfully: {result}")
         return True
     except Exception as e:
@@ -100,7 +121,7 @@ def test_large_message():
         return False
 
 
-def test_error_conditions():
+def test_error_conditions(pipe_name='simple'):
     """Test various error conditions."""
     print("\n=== Error Condition Tests ===")
 
@@ -109,9 +130,14 @@ def test_error_conditions():
     # Test 1: Non-existent pipe
     print("1. Testing non-existent pipe...")
     try:
-        pipecom.send('nonexistent_pipe_12345', 'test', timeout=1, max_attempts=1)
-        print("❌ Expected error but none occurred")
-        test_results.append(False)
+        # Probing finds the pipe missing without connecting to it
+        if pipecom.exists('nonexistent_pipe_12345'):
+            print("❌ Expected no listener but found one")
+            test_results.append(False)
+        else:
+            pipecom.send('nonexistent_pipe_12345', 'test', timeout=1, max_attempts=1)
+            print("❌ Expected error but none occurred")
+            test_results.append(False)
     except PipeError as e:
         print(f"✅ Expected PipeError: {e}")
         test_results.append(True)
@@ -121,23 +147,21 @@ def test_error_conditions():
 
     # Test 2: Empty message
     print("\n2. Testing empty message...")
-    try:
-        result = pipecom.send('simple', '', timeout=5, max_attempts=3)
+    result, error_code = pipecom.try_send(pipe_name, '', timeout=5, max_attempts=3)
+    if result:
         print(f"✅ Empty message handled: {result}")
-        test_results.append(True)
-    except Exception as e:
-        print(f"❌ Error with empty message: {e}")
-        test_results.append(False)
+    else:
+        print(f"❌ Error with empty message: {error_code}")
+    test_results.append(result)
 
     # Test 3: Very short timeout
     print("\n3. Testing very short timeout...")
-    try:
-        result = pipecom.send('simple', 'timeout test', timeout=0.1, max_attempts=1)
+    result, error_code = pipecom.try_send(pipe_name, 'timeout test', timeout=0.1, max_attempts=1)
+    if error_code is None:
         print(f"Result with short timeout: {result}")
-        test_results.append(True)
-    except Exception as e:
-        print(f"Short timeout result: {e}")
-        test_results.append(True)  # Expected to potentially fail
+    else:
+        print(f"Short timeout result: {error_code}")
+    test_results.append(True)  # Expected to potentially fail
 
     success_count = sum(test_results)
     print(f"\n📊 Error condition tests: {success_count}/{len(test_results)} passed")
@@ -145,73 +169,134 @@ def test_error_conditions():
     return success_count >= len(test_results) - 1  # Allow one failure
 
 
+@dataclass(slots=True)
+class WorkerResult:
+    """Outcome of one message sent by a concurrent send worker."""
+    worker_id: int
+    seq: int
+    ok: bool
+
+
+async def send_worker(worker_id, message_count, conn):
+    """Send one worker's messages and return their results."""
+    # Format the worker's part once; each message then only appends its number
+    prefix = f"Worker-{worker_id}-Message-".encode('ascii')
+    msgs = [prefix + b'%d' % (i + 1) for i in range(message_count)]
+    try:
+        # All of the worker's messages are in flight at once rather than sent one after another
+        sent = await asyncio.gather(*(conn.send_async(msg, max_attempts=3) for msg in msgs))
+        print(f"Worker {worker_id}: Sent {message_count} messages - {all(sent)}")
+    except Exception as e:
+        print(f"Worker {worker_id}: Error sending messages: {e}")
+        sent = [False] * message_count
+    return [WorkerResult(worker_id, i + 1, ok) for i, ok in enumerate(sent)]
+
+
+async def run_workers(worker_count, message_count):
+    """Run every send worker as a coroutine on one event loop, sharing one connection."""
+    with pipecom.connection('simple', timeout=5) as conn:
+        return await asyncio.gather(*(send_worker(worker_id, message_count, conn)
+                                      for worker_id in range(worker_count)))
+
+
 def test_concurrent_sends():
-    """Test concurrent sending from multiple threads."""
+    """Test concurrent sending from multiple coroutines."""
     print("\n=== Concurrent Send Test ===")
 
-    import threading
-    results = []
+    results = [r for worker_results in asyncio.run(run_workers(3, 2)) for r in worker_results]
 
-    def send_worker(worker_id, message_count):
-        worker_results = []
-        for i in range(message_count):
-            try:
-                msg = f"Worker-{worker_id}-Message-{i+1}"
-                result = pipecom.send('simple', msg, timeout=5, max_attempts=3)
-                worker_results.append(result)
-                print(f"Worker {worker_id}: Sent message {i+1} - {result}")
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"Worker {worker_id}: Error on message {i+1}: {e}")
-                worker_results.append(False)
-        results.extend(worker_results)
-
-    # Start multiple worker threads
-    threads = []
-    for worker_id in range(3):
-        thread = threading.Thread(target=send_worker, args=(worker_id, 2))
-        threads.append(thread)
-        thread.start()
-
-    # Wait for all threads to complete
-    for thread in threads:
-        thread.join()
-
-    success_count = sum(1 for r in results if r)
+    # send_async() returns a bool, so every ok flag can be counted with list.count
+    success_count = [r.ok for r in results].count(True)
     print(f"\n📊 Concurrent sends: {success_count}/{len(results)} successful")
 
     return success_count >= len(results) * 0.8  # Allow 20% failure rate
 
 
+def read_lines(prompt):
+    """Yield lines typed at the terminal, or every line of stdin when it is piped in."""
+    if not sys.stdin.isatty():
+        # Scripted input: stream lines straight from stdin without prompting for each one
+        yield from sys.stdin
+        return
+
+    try:
+        # Imported only for its side effect: loading readline gives input() line editing and history
+        importlib.import_module('readline')
+    except ImportError:
+        pass
+    while True:
+        try:
+            yield input(prompt)
+        except EOFError:
+            return
+
+
 def interactive_mode():
     """Interactive mode for manual testing."""
     print("\n=== Interactive Mode ===")
     print("Enter messages to send (type 'quit' to exit, 'die' to stop listener):")
 
-    while True:
-        try:
-            message = input("Message> ").strip()
+    try:
+        with pipecom.connection('simple', timeout=5) as conn:
+            for line in read_lines("Message> "):
+                try:
+                    message = line.strip()
 
-            if message.lower() == 'quit':
-                break
-            elif message.lower() == 'die':
-                message = "PIPECOM_DIE"
+                    if message.lower() == 'quit':
+                        break
+                    elif message.lower() == 'die':
+                        message = "PIPECOM_DIE"
 
-            if message:
-                result = pipecom.send('simple', message, timeout=5, max_attempts=3)
-                print(f"Result: {result}")
+                    if message:
+                        result = conn.send(message, max_attempts=3)
+                        print(f"Result: {result}")
 
-                if message == "PIPECOM_DIE":
-                    print("Sent shutdown signal to listener")
-                    break
-            else:
-                print("Empty message, try again...")
+                        if message == "PIPECOM_DIE":
+                            print("Sent shutdown signal to listener")
+                            break
+                    else:
+                        print("Empty message, try again...")
 
-        except KeyboardInterrupt:
-            print("\nExiting interactive mode...")
-            break
-        except Exception as e:
-            print(f"Error: {e}")
+                except Exception as e:
+                    print(f"Error: {e}")
+
+    except KeyboardInterrupt:
+        print("\nExiting interactive mode...")
+
+
+def listen_mode():
+    """Serve every pipe the test suite sends to, printing each message, until Ctrl+C."""
+    print("\n=== Listener Mode ===")
+
+    pipe_names = ['simple', *_PARALLEL_PIPES.values()]
+    for pipe_name in pipe_names:
+        pipecom.Pipe(pipe_name, functools.partial(print, f"📨 {pipe_name}:")).listen()
+    print(f"Listening on {', '.join(pipe_names)} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nStopping listeners...")
+    for pipe_name in pipe_names:
+        # A pipe stopped by 'die' in interactive mode has no listener left to stop
+        if pipecom.exists(pipe_name):
+            pipecom.try_send(pipe_name, "PIPECOM_DIE", timeout=1, max_attempts=1)
+
+
+def run_test(test_name, test_func):
+    """Run one test function and return its name with whether it passed."""
+    print(f"\n{'='*50}")
+    print(f"Running: {test_name}")
+    print('='*50)
+
+    try:
+        result = test_func()
+        print(f"\n{test_name}: {'✅ PASSED' if result else '❌ FAILED'}")
+    except Exception as e:
+        print(f"\n{test_name}: ❌ FAILED with exception: {e}")
+        result = False
+    return test_name, result
 
 
 def main():
@@ -222,6 +307,9 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] == 'interactive':
         interactive_mode()
         return
+    if len(sys.argv) > 1 and sys.argv[1] == 'listen':
+        listen_mode()
+        return
 
     # Run all tests
     tests = [
@@ -233,31 +321,35 @@ def main():
         ("Concurrent Sends", test_concurrent_sends)
     ]
 
-    print("Make sure test.py is running in another terminal first!")
-    input("Press Enter when ready to start tests...")
+    print(f"Make sure 'python {sys.argv[0]} listen' is running in another terminal first!")
+    # PIPECOM_TEST_AUTO=1 skips the prompt for scripted runs
+    if not os.environ.get('PIPECOM_TEST_AUTO'):
+        input("Press Enter when ready to start tests...")
+
+    # These tests do not depend on each other, so they run side by side in worker processes,
+    # each against its own pipe so one test's messages never show up on another's
+    outcomes = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(run_test, test_name,
+                                   functools.partial(test_func, pipe_name=_PARALLEL_PIPES[test_name]))
+                   for test_name, test_func in tests if test_name in _PARALLEL_PIPES]
+        for future in concurrent.futures.as_completed(futures):
+            test_name, result = future.result()
+            outcomes[test_name] = result
 
-    results = []
     for test_name, test_func in tests:
-        print(f"\n{'='*50}")
-        print(f"Running: {test_name}")
-        print('='*50)
-
-        try:
-            result = test_func()
-            results.append((test_name, result))
-            print(f"\n{test_name}: {'✅ PASSED' if result else '❌ FAILED'}")
-        except Exception as e:
-            print(f"\n{test_name}: ❌ FAILED with exception: {e}")
-            results.append((test_name, False))
+        if test_name not in _PARALLEL_PIPES:
+            time.sleep(1)  # Brief pause between ordered tests
+            outcomes[test_name] = run_test(test_name, test_func)[1]
 
-        time.sleep(1)  # Brief pause between tests
+    results = [(test_name, outcomes[test_name]) for test_name, _ in tests]
 
     # Summary
     print(f"\n{'='*50}")
     print("TEST SUMMARY")
     print('='*50)
 
-    passed = sum(1 for _, result in results if result)
+    passed = [result for _, result in results].count(True)
     total = len(results)
 
     for test_name, result in results: